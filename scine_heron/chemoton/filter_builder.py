@@ -208,7 +208,7 @@ class FilterBuilder(ComboBoxTabWidget):
         states = self.get_states()
         if filename.suffix == ".json":
             with open(filename, "w") as f:
-                f.write(encode(states))
+                f.write(encode(states, pretty=True))
         else:
             with open(filename, "wb") as f:
                 pickle.dump(states, f)
@@ -295,7 +295,7 @@ class RuleSetBuilder(QDialog):
             return
         if filename.suffix == ".json":
             with open(filename, "w") as f:
-                f.write(json_wrap.encode(self._options))
+                f.write(json_wrap.encode(self._options, pretty=True))
         elif filename.suffix == ".txt":
             # relies on that every rule set and rule has a proper __repr__
             with open(filename, "w") as f:
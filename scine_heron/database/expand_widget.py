@@ -4,8 +4,7 @@ __copyright__ = """ This code is licensed under the 3-clause BSD license.
 Copyright ETH Zurich, Department of Chemistry and Applied Biosciences, Reiher Group.
 See LICENSE.txt for details.
 """
-from typing import Dict, Optional, Any, List, Union
-import json
+from typing import Dict, Optional, Any, List, Tuple, Union
 import numpy as np
 
 from scine_database.queries import optimized_labels_enums
@@ -50,7 +49,6 @@ from PySide2.QtGui import (
 from PySide2.QtCore import (
     Qt,
     QPoint,
-    QTimeLine,
     QEvent,
 )
 
@@ -238,11 +236,6 @@ class ExpandedSingleCompoundNetwork(QGraphicsView):
         self.plot_network_compound()
 
     def plot_network_compound(self) -> None:
-        # Create singular timer for all added animated items
-        self.timer = QTimeLine(1000)
-        self.frames = 40
-        self.timer.setFrameRange(0, self.frames)
-
         # db-info of selected compound
         compound_collection = self.db_manager.get_collection("compounds")
         flask_collection = self.db_manager.get_collection("flasks")
@@ -272,24 +265,21 @@ class ExpandedSingleCompoundNetwork(QGraphicsView):
         # calculate angle depending on number of nodes
         if not self.__unique_structures:
             return
-        number_of_structures = len(self.__unique_structures)
-        angle_alpha = 360 / number_of_structures
-        list_of_angles = []
-        for i in range(number_of_structures):
-            list_of_angles.append(i * angle_alpha)
+        angles = np.linspace(0.0, 2.0 * np.pi, len(self.__unique_structures), endpoint=False)
 
         # position of nodes in circle around center
-        pos = []
-        for angle in list_of_angles:
-            pos.append((np.cos(np.pi * (angle / 180)), np.sin(np.pi * (angle / 180))))
+        pos = 250 * np.column_stack((np.cos(angles), np.sin(angles)))
+
+        # all edges between center node and structures share a single path item
+        side_point = QPoint(self.centroid_item.center())
+        edges_path = QPainterPath()
 
         # make circle around center-compound out of structure-nodes
         for i, sid in enumerate(self.__unique_structures):
             s = db.Structure(db.ID(sid))
             s.link(structure_collection)
 
-            x = 250 * pos[i][0]
-            y = 250 * pos[i][1]
+            x, y = pos[i]
             self.compounds[i] = Structure(
                 x, y, pen=self.structure_pen, brush=self.structure_brush
             )
@@ -298,15 +288,13 @@ class ExpandedSingleCompoundNetwork(QGraphicsView):
             self.scene_object.addItem(self.compounds[i])
             self.item_list[1].append(self.compounds[i])
 
-            # draw edges between center node and structures
-            side_point = QPoint(self.centroid_item.center())
-            path = QPainterPath(self.compounds[i].center())
-            path.lineTo(side_point)
-            self.scene_object.addPath(path, pen=self.path_pen)
+            # draw edge between center node and structure
+            edges_path.moveTo(self.compounds[i].center())
+            edges_path.lineTo(side_point)
+        self.scene_object.addPath(edges_path, pen=self.path_pen)
 
         # Move nodes above lines
         self.__move_to_foreground(self.compounds)
-        self.timer.start()
 
     def wheelEvent(self, event):
         modifiers = QGuiApplication.keyboardModifiers()
@@ -681,17 +669,7 @@ class ExpandedSingleReactionNetwork(QGraphicsView):
 
         self.plot_network_reaction()
 
-    def __getitem__(self, i):
-        # get information of database
-        # to make subscriptable
-        return f"{i}"
-
     def plot_network_reaction(self) -> None:
-        # Create singular timer for all added animated items
-        self.timer = QTimeLine(1000)
-        self.frames = 40
-        self.timer.setFrameRange(0, self.frames)
-
         # db-info of selected compound
         structure_collection = self.db_manager.get_collection("structures")
         compound_collection = self.db_manager.get_collection("compounds")
@@ -722,45 +700,46 @@ class ExpandedSingleReactionNetwork(QGraphicsView):
             rhs_id = db.ID(rhs_element["id"]["$oid"])
             if rhs_element["type"] == "compound":
                 ag: Union[db.Compound, db.Flask] = db.Compound(rhs_id, compound_collection)
-                rhs_aggregate = json.loads(str(ag))
             elif rhs_element["type"] == "flask":
                 ag = db.Flask(rhs_id, flask_collection)
-                rhs_aggregate = json.loads(str(ag))
             else:
                 raise RuntimeError("Unknown aggregate type in database.")
-            self.total_number_structures_rhs.extend(rhs_aggregate["structures"])
-            list_add_rhs.append(rhs_aggregate["structures"])
+            rhs_structures = [{'$oid': sid.string()} for sid in ag.get_structures()]
+            self.total_number_structures_rhs.extend(rhs_structures)
+            list_add_rhs.append(rhs_structures)
 
         self.total_number_structures_rhs = [dict(tupleized) for tupleized in set(
             tuple(item.items()) for item in self.total_number_structures_rhs)]  # reduce duplicated structure
 
         pos3_y = self.window_height / 2
         all_structure_ids = set()
-        for i in range(len(self.total_number_elementary_steps)):
+        # reactant ids of each elementary step, reused when the steps are linked to the structures
+        reactant_ids_of_step: Dict[str, Tuple[List[str], List[str]]] = {}
+        for i, step_id in enumerate(self.total_number_elementary_steps):
             if i % 2 == 0 or i == 0:
                 pos3_y = pos3_y - i * 30
             else:
                 pos3_y = pos3_y + i * 30
 
-            elementary_reaction_step = db.ElementaryStep(db.ID(self.total_number_elementary_steps[i]["$oid"]),
-                                                         elementary_step_collection)
+            elementary_reaction_step = db.ElementaryStep(db.ID(step_id["$oid"]), elementary_step_collection)
             self.elementary_reaction_step_item = Reaction(
                 pos_elementary_steps_x, pos3_y, pen=self.elementary_step_pen, brush=self.elementary_step_brush
             )
             self.elementary_reaction_step_item.db_representation = elementary_reaction_step
             lhs, rhs = elementary_reaction_step.get_reactants(db.Side.BOTH)
-            for lhs_id in lhs:
-                all_structure_ids.add(str(lhs_id))
-            for rid in rhs:
-                all_structure_ids.add(str(rid))
+            lhs_ids = [db_id.string() for db_id in lhs]
+            rhs_ids = [db_id.string() for db_id in rhs]
+            all_structure_ids.update(lhs_ids)
+            all_structure_ids.update(rhs_ids)
 
             self.__bind_functions_to_object(self.elementary_reaction_step_item)
             elemen_string = elementary_reaction_step.id().string()
+            reactant_ids_of_step[elemen_string] = (lhs_ids, rhs_ids)
             self.elementary[elemen_string] = self.elementary_reaction_step_item
             self.scene_object.addItem(self.elementary[elemen_string])
 
         # layer 1 for compound_rhs
-        for i in range(len(self.total_number_compound_rhs)):
+        for i, rhs_entry in enumerate(self.total_number_compound_rhs):
             pos1_y = self.window_height / 2
             if len(self.total_number_compound_rhs) == 1:
                 pos1_y = self.window_height / 2
@@ -769,8 +748,12 @@ class ExpandedSingleReactionNetwork(QGraphicsView):
                     pos1_y -= 150
                 else:
                     pos1_y += 150
-            type_str = self.total_number_compound_rhs[i]["type"]
-            a_id = db.ID(self.total_number_compound_rhs[i]["id"]["$oid"])
+            cid_string = rhs_entry["id"]["$oid"]
+            # aggregates occurring multiple times on one side are drawn once
+            if cid_string in self.compounds_rhs:
+                continue
+            type_str = rhs_entry["type"]
+            a_id = db.ID(cid_string)
             a_type = db.CompoundOrFlask.COMPOUND if type_str == "compound" else db.CompoundOrFlask.FLASK
             compound_in = get_compound_or_flask(a_id, a_type, compound_collection, flask_collection)
             self.compound_in_item = Compound(
@@ -779,16 +762,18 @@ class ExpandedSingleReactionNetwork(QGraphicsView):
             self.compound_in_item.db_representation = compound_in
 
             self.__bind_functions_to_object(self.compound_in_item)
-            cid_string = compound_in.id().string()
             self.compounds_rhs[cid_string] = self.compound_in_item
             self.scene_object.addItem(self.compounds_rhs[cid_string])
 
         # layer 2 for structure_rhs
+        ids = [value["id"]['$oid'] for value in self.total_number_compound_rhs]
+        structure_ids_of_aggregate = {
+            aggregate_id['$oid']: {structure['$oid'] for structure in structures}
+            for aggregate_id, structures in zip(list_add_rhs[::2], list_add_rhs[1::2])
+        }
         pos2_y = self.window_height / 2
-        relevant_structures_rhs = []
-        for i in range(len(self.total_number_structures_rhs)):
-            if self.total_number_structures_rhs[i]['$oid'] in all_structure_ids:
-                relevant_structures_rhs.append(self.total_number_structures_rhs[i])
+        relevant_structures_rhs = [structure for structure in self.total_number_structures_rhs
+                                   if structure['$oid'] in all_structure_ids]
 
         for i, relevant_structure in enumerate(relevant_structures_rhs):
             if i % 2 == 0 or i == 0:
@@ -808,37 +793,30 @@ class ExpandedSingleReactionNetwork(QGraphicsView):
             self.scene_object.addItem(self.structure_rhs[rhs_string])
 
             # add lines layer 12
-            ids = [value["id"]['$oid'] for value in self.total_number_compound_rhs]
             side_point = QPoint(structure_in_item.center())
             rid_str = structure_in_item.db_representation.id().string()
             for k, c in enumerate(ids):
-                if c == list_add_rhs[0]['$oid']:
-                    for j in range(len(list_add_rhs[1])):
-                        if rid_str in list_add_rhs[1][j]['$oid']:
-                            path = QPainterPath(self.compounds_rhs[c].center())
-                            path.lineTo(side_point)
-                            lid = rid_str + "_" + c + "_" + str(k)
-                            self.line_items1[lid] = self.scene_object.addPath(path, pen=self.path_pen)
-
-                elif c == list_add_rhs[2]['$oid']:
-                    for j in range(len(list_add_rhs[3])):
-                        if rid_str in list_add_rhs[3][j]['$oid']:
-                            path = QPainterPath(self.compounds_rhs[c].center())
-                            path.lineTo(side_point)
-                            lid = rid_str + "_" + c + "_" + str(k)
-                            self.line_items1[lid] = self.scene_object.addPath(path, pen=self.path_pen)
+                if rid_str in structure_ids_of_aggregate[c]:
+                    path = QPainterPath(self.compounds_rhs[c].center())
+                    path.lineTo(side_point)
+                    lid = rid_str + "_" + c + "_" + str(k)
+                    self.line_items1[lid] = self.scene_object.addPath(path, pen=self.path_pen)
 
         # layer 5 for compound_lhs
         self.list_compound_out_item = []
-        for i in range(len(self.total_number_compound_lhs)):
+        for i, lhs_entry in enumerate(self.total_number_compound_lhs):
             pos5_y = self.window_height / 2
             if i % 2 == 0 or i == 0:
                 pos5_y += 150
             else:
                 pos5_y -= 150
 
-            a_id = db.ID(self.total_number_compound_lhs[i]["id"]["$oid"])
-            type_str = self.total_number_compound_lhs[i]["type"]
+            comin_string = lhs_entry["id"]["$oid"]
+            # aggregates occurring multiple times on one side are drawn once
+            if comin_string in self.compounds_lhs:
+                continue
+            a_id = db.ID(comin_string)
+            type_str = lhs_entry["type"]
             a_type = db.CompoundOrFlask.COMPOUND if type_str == "compound" else db.CompoundOrFlask.FLASK
             compound_out = get_compound_or_flask(a_id, a_type, compound_collection, flask_collection)
             compound_out_item = Compound(
@@ -851,7 +829,6 @@ class ExpandedSingleReactionNetwork(QGraphicsView):
             compound_out_item.db_representation = compound_out
 
             self.__bind_functions_to_object(compound_out_item)
-            comin_string = compound_out.id().string()
             self.compounds_lhs[comin_string] = compound_out_item
             self.scene_object.addItem(self.compounds_lhs[comin_string])
 
@@ -864,24 +841,26 @@ class ExpandedSingleReactionNetwork(QGraphicsView):
             lhs_id = db.ID(lhs_element["id"]["$oid"])
             if lhs_element["type"] == "compound":
                 ag = db.Compound(lhs_id, compound_collection)
-                lhs_aggregate = json.loads(str(ag))
             elif lhs_element["type"] == "flask":
                 ag = db.Flask(lhs_id, flask_collection)
-                lhs_aggregate = json.loads(str(ag))
             else:
                 raise RuntimeError("Unknown aggregate type in database.")
-            self.total_number_structures_lhs.extend(lhs_aggregate["structures"])
-            list_add_lhs.append(lhs_aggregate["structures"])
+            lhs_structures = [{'$oid': sid.string()} for sid in ag.get_structures()]
+            self.total_number_structures_lhs.extend(lhs_structures)
+            list_add_lhs.append(lhs_structures)
 
         self.total_number_structures_lhs = [dict(tupleized) for tupleized in set(
             tuple(item.items()) for item in self.total_number_structures_lhs)]  # reduce duplicated structure
 
         # layer 4 for structure_lhs
+        ids = [value["id"]['$oid'] for value in self.total_number_compound_lhs]
+        structure_ids_of_aggregate = {
+            aggregate_id['$oid']: {structure['$oid'] for structure in structures}
+            for aggregate_id, structures in zip(list_add_lhs[::2], list_add_lhs[1::2])
+        }
         pos4_y = self.window_height / 2
-        relevant_structures_lhs = []
-        for i in range(len(self.total_number_structures_lhs)):
-            if self.total_number_structures_lhs[i]['$oid'] in all_structure_ids:
-                relevant_structures_lhs.append(self.total_number_structures_lhs[i])
+        relevant_structures_lhs = [structure for structure in self.total_number_structures_lhs
+                                   if structure['$oid'] in all_structure_ids]
 
         for i, relevant_structure in enumerate(relevant_structures_lhs):
             if i % 2 == 0 or i == 0:
@@ -901,45 +880,32 @@ class ExpandedSingleReactionNetwork(QGraphicsView):
             self.scene_object.addItem(self.structure_lhs[lhs_string])
 
             # add lines layer 45
-            ids = [value["id"]['$oid'] for value in self.total_number_compound_lhs]
             side_point = QPoint(self.structure_out_item.center())
             rid_str = self.structure_out_item.db_representation.id().string()
             for k, c in enumerate(ids):
-                if c == list_add_lhs[0]['$oid']:
-                    for j in range(len(list_add_lhs[1])):
-                        if rid_str in list_add_lhs[1][j]['$oid']:
-                            path = QPainterPath(self.compounds_lhs[c].center())
-                            path.lineTo(side_point)
-                            lid = rid_str + "_" + c + "_" + str(k)
-                            self.line_items5[lid] = self.scene_object.addPath(path, pen=self.path_pen)
-
-                elif c == list_add_lhs[2]['$oid']:
-                    for j in range(len(list_add_lhs[3])):
-                        if rid_str in list_add_lhs[3][j]['$oid']:
-                            path = QPainterPath(self.compounds_lhs[c].center())
-                            path.lineTo(side_point)
-                            lid = rid_str + "_" + c + "_" + str(k)
-                            self.line_items5[lid] = self.scene_object.addPath(path, pen=self.path_pen)
+                if rid_str in structure_ids_of_aggregate[c]:
+                    path = QPainterPath(self.compounds_lhs[c].center())
+                    path.lineTo(side_point)
+                    lid = rid_str + "_" + c + "_" + str(k)
+                    self.line_items5[lid] = self.scene_object.addPath(path, pen=self.path_pen)
 
         pos3_y = self.window_height / 2
-        for i in range(len(self.total_number_elementary_steps)):
+        for i, step_id in enumerate(self.total_number_elementary_steps):
             if i % 2 == 0 or i == 0:
                 pos3_y = pos3_y - i * 30
             else:
                 pos3_y = pos3_y + i * 30
 
-            elementary_reaction_step = db.ElementaryStep(db.ID(self.total_number_elementary_steps[i]["$oid"]),
-                                                         elementary_step_collection)
+            elementary_reaction_step = db.ElementaryStep(db.ID(step_id["$oid"]), elementary_step_collection)
             self.elementary_reaction_step_item = Reaction(
                 pos_elementary_steps_x, pos3_y, pen=self.elementary_step_pen, brush=self.elementary_step_brush
             )
             self.elementary_reaction_step_item.db_representation = elementary_reaction_step
-            reactant_structures = elementary_reaction_step.get_reactants(db.Side.BOTH)
-            self.elementary_reaction_step_item.lhs_ids = [db_id.string() for db_id in reactant_structures[0]]
-            self.elementary_reaction_step_item.rhs_ids = [db_id.string() for db_id in reactant_structures[1]]
+            elemen_string = elementary_reaction_step.id().string()
+            self.elementary_reaction_step_item.lhs_ids, self.elementary_reaction_step_item.rhs_ids = \
+                reactant_ids_of_step[elemen_string]
 
             self.__bind_functions_to_object(self.elementary_reaction_step_item)
-            elemen_string = elementary_reaction_step.id().string()
             self.elementary[elemen_string] = self.elementary_reaction_step_item
             self.elementary[elemen_string].setAcceptHoverEvents(True)
             self.elementary[elemen_string].bind_hover_enter_function(
@@ -977,8 +943,6 @@ class ExpandedSingleReactionNetwork(QGraphicsView):
         self.__move_to_foreground(self.structure_lhs)
         self.__move_to_foreground(self.compounds_lhs)
 
-        self.timer.start()
-
         self.scene_object.update()
         self.view = QGraphicsView(self.scene_object)
         # rendering smoother lines and edges of nodes
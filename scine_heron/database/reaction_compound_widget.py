@@ -40,6 +40,7 @@ from scine_database.energy_query_functions import (
 )
 import scine_database as db
 import copy
+from itertools import chain
 import networkx as nx
 import numpy as np
 from json import dumps
@@ -329,12 +330,12 @@ class CRNetwork(ReactionAndCompoundView):
         self._currently_plotting = True
         self.remove_all_items()
         # # # Add new items
-        for k in self.line_items.keys():
-            self.scene_object.addItem(self.line_items[k])
-        for c in self.compounds.keys():
-            self.scene_object.addItem(self.compounds[c][0])
-        for r in self.reactions.keys():
-            self.scene_object.addItem(self.reactions[r][0])
+        for line_item in self.line_items.values():
+            self.scene_object.addItem(line_item)
+        for c_list in self.compounds.values():
+            self.scene_object.addItem(c_list[0])
+        for r_list in self.reactions.values():
+            self.scene_object.addItem(r_list[0])
         self.__center_view()
 
         self._currently_plotting = False
@@ -412,7 +413,7 @@ class CRNetwork(ReactionAndCompoundView):
             max_dimensions = (int(1000 * 1.5), 1000)
 
         # # # Retrieve positions
-        if "positions" not in self.subgraph_cache[self.current_centroid_id].keys():
+        if "positions" not in self.subgraph_cache[self.current_centroid_id]:
 
             positions = self.__get_node_positions_for_subgraph(self.current_centroid_id, centroid_sub_graph,
                                                                reaction_nodes, aggregate_nodes, dist_value)
@@ -461,8 +462,8 @@ class CRNetwork(ReactionAndCompoundView):
                               a_type: db.CompoundOrFlask, allow_focus=True) -> Tuple[Compound, str]:
         cid_string = db_compound.id().string()
         # Look up in cache first
-        if self.current_centroid_id in self.subgraph_cache.keys() and\
-           cid_string in self.subgraph_cache[self.current_centroid_id]['compounds'].keys():
+        if self.current_centroid_id in self.subgraph_cache and\
+           cid_string in self.subgraph_cache[self.current_centroid_id]['compounds']:
             old_compound_item = self.subgraph_cache[self.current_centroid_id]['compounds'][cid_string]
             # # # Copy stored compound item - necessary for scaling in this thread
             compound_item = Compound(old_compound_item.x_coord, old_compound_item.y_coord,
@@ -511,7 +512,7 @@ class CRNetwork(ReactionAndCompoundView):
         assert self.settings
         plot_item = True
         # Look up in cache first
-        if reaction.id().string() in self.subgraph_cache[self.current_centroid_id]['reactions'].keys():
+        if reaction.id().string() in self.subgraph_cache[self.current_centroid_id]['reactions']:
             old_reaction_item = self.subgraph_cache[self.current_centroid_id]['reactions'][reaction.id().string()]
             # # # Copy stored reaction item - necessary for scaling in this thread
             reaction_item = Reaction(old_reaction_item.x_coord, old_reaction_item.y_coord,
@@ -612,7 +613,7 @@ class CRNetwork(ReactionAndCompoundView):
 
     def __build_edge(self, start: QPoint, end: QPoint, line_id: str):
         # Look edge up in cache first
-        if line_id in self.subgraph_cache[self.current_centroid_id]['lines'].keys():
+        if line_id in self.subgraph_cache[self.current_centroid_id]['lines']:
             edge_item = self.subgraph_cache[self.current_centroid_id]['lines'][line_id]
         else:
             path = QPainterPath(start)
@@ -674,7 +675,7 @@ class CRNetwork(ReactionAndCompoundView):
         # Attempt reset
         centroid_subgraph = None
         undirected_graph = self._graph.to_undirected()
-        if centroid_id not in self.subgraph_cache.keys():
+        if centroid_id not in self.subgraph_cache:
             # # # Reactions outgoing from current centroid only!
             for centroid_edge in self._graph.out_edges(centroid_id):
                 reaction_nodes.append(centroid_edge[1])
@@ -682,7 +683,7 @@ class CRNetwork(ReactionAndCompoundView):
                     if reaction_edge[1] != centroid_id:
                         aggregate_nodes.append(reaction_edge[1])
             # Extract from subgraph from graph
-            centroid_subgraph = self._graph.subgraph([centroid_id] + reaction_nodes + aggregate_nodes).copy()
+            centroid_subgraph = self._graph.subgraph(chain([centroid_id], reaction_nodes, aggregate_nodes)).copy()
             # Reset weights to one
             # NOTE: If not basic, with barrier info, one could attempt incorporating this information
             for edge in centroid_subgraph.edges:
@@ -786,6 +787,9 @@ class CRNetwork(ReactionAndCompoundView):
 
     def __build_subgraph_items(self, subgraph: nx.DiGraph,
                                positions: Dict[str, Tuple[int, int]], reaction_nodes: List[str]):
+        # Stack all positions once to gather the neighbors of each reaction node by index
+        node_indices = {node_id: index for index, node_id in enumerate(positions)}
+        position_matrix = np.asarray(list(positions.values()))
         # NOTE: parallelize this!
         for node in reaction_nodes:
             # Draw Rxn Nodes and edges
@@ -796,26 +800,27 @@ class CRNetwork(ReactionAndCompoundView):
             if rxn_item is None:
                 continue
             # # # Rotate rxn item such that the rhs side points to the average outgoing position
-            out_positions = np.array([np.array(positions[edge[1]]) for edge in subgraph.out_edges(node)])
+            out_indices = [node_indices[edge[1]] for edge in subgraph.out_edges(node)]
             # Obtain relative vector of all outgoing positions
-            rel_out_positions = np.sum(out_positions - np.array(positions[node]), axis=0)
+            rel_out_positions = position_matrix.take(out_indices, axis=0).sum(axis=0) \
+                - len(out_indices) * position_matrix[node_indices[node]]
             # Calculate angle to match the outgoing of the rxn item
             # with the average relative vector of the products
             # range from 0 to 2*pi, arctan(cross.norm, dot)
-            rot_angle = np.arctan2(-rel_out_positions[1], np.dot(rel_out_positions, np.array([1, 0])))
+            rot_angle = np.arctan2(-rel_out_positions[1], rel_out_positions[0])
             rot_angle += 2 * np.pi if rot_angle < 0 else 0
             rxn_item.update_angle(rot_angle)
             # # # Draw incoming edges of rxn node
             for e_count, edge in enumerate(subgraph.in_edges(node)):
                 # Draw edge from aggregate to lhs of rxn
-                line_id = "_".join(list(edge)) + "_" + str(e_count)
+                line_id = "_".join(edge) + "_" + str(e_count)
                 edge_item = self.__build_edge(QPoint(positions[edge[0]][0],
                                                      positions[edge[0]][1]),
                                               rxn_item.incoming(), line_id)
                 self.line_items[line_id] = edge_item
 
                 # Check if compound is drawn already
-                if edge[0] not in self.compounds.keys():
+                if edge[0] not in self.compounds:
                     # Retrieve information of aggregate
                     aggregate, a_type = self.__get_aggregate_and_type_from_graph(edge[0])
                     a_position = positions[edge[0]]
@@ -824,14 +829,14 @@ class CRNetwork(ReactionAndCompoundView):
             # # # Draw outgoing edges of rxn node
             for e_count, edge in enumerate(subgraph.out_edges(node)):
                 # Draw edge from rhs of rxn to aggregate
-                line_id = "_".join(list(edge)) + "_" + str(e_count)
+                line_id = "_".join(edge) + "_" + str(e_count)
                 edge_item = self.__build_edge(rxn_item.outgoing(),
                                               QPoint(positions[edge[1]][0],
                                                      positions[edge[1]][1]),
                                               line_id)
                 self.line_items[line_id] = edge_item
                 # Check if compound is drawn already, else draw
-                if edge[1] not in self.compounds.keys():
+                if edge[1] not in self.compounds:
                     # Retrieve information of aggregate
                     aggregate, a_type = self.__get_aggregate_and_type_from_graph(edge[1])
                     a_position = positions[edge[1]]
@@ -850,10 +855,6 @@ class CRNetwork(ReactionAndCompoundView):
         object.bind_hover_leave_function(self.hover_leave_function)
         object.bind_menu_function(self.menu_function)
 
-    def __getitem__(self, i):
-        # get information of database to make subscriptable
-        return f"{i}"
-
 
 class CRSettings(ReactionAndCompoundViewSettings):
 
@@ -7,7 +7,7 @@ See LICENSE.txt for details.
 import numpy as np
 from datetime import timedelta
 from json import dumps
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 from scine_database.queries import finished_calculations, unstarted_calculations
 
@@ -25,10 +25,27 @@ from PySide2.QtWidgets import QPushButton, QVBoxLayout, QDialog, QLabel
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
 from matplotlib.figure import Figure
 
+# the selections do not change, serialize them only once
+_FINISHED_SELECTION = dumps(finished_calculations())
+_PENDING_SELECTION = dumps({"status": "pending"})
+_UNSTARTED_SELECTION = dumps(unstarted_calculations())
+
+
+def _log_histogram(values) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the counts and edges of a histogram with logarithmically spaced bins.
+    The number of bins grows with the square root of the number of values, between 10 and 50.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n_bins = max(10, min(50, int(np.sqrt(len(values)))))
+    edges = np.logspace(np.floor(np.log10(values.min())), np.ceil(np.log10(values.max())), n_bins + 1)
+    counts, _ = np.histogram(values, bins=edges)
+    return counts, edges
+
 
 class RuntimeHistogramDialog(QDialog):
     class Chart(FigureCanvasQTAgg):
-        def __init__(self, db_manager, width=5, height=4) -> None:
+        def __init__(self, db_manager, pool: Optional[QThreadPool] = None, width=5, height=4) -> None:
             self.fig = Figure(figsize=(width, height))
             self.ax1 = self.fig.add_subplot(2, 1, 1)
             self.ax2 = self.fig.add_subplot(2, 1, 2)
@@ -38,13 +55,16 @@ class RuntimeHistogramDialog(QDialog):
             color_axis(self.ax1)
             super(RuntimeHistogramDialog.Chart, self).__init__(self.fig)
             self.db_manager = db_manager
+            self.pool = pool if pool is not None else QThreadPool.globalInstance()
             self.ax1.cla()
             self.ax2.cla()
             self.fig.tight_layout()
             self.draw()
             self.__currently_updating = False
-            self.walltime: List[float] = []
-            self.cpuh: List[float] = []
+            self.walltime: np.ndarray = np.ones(1)
+            self.cpuh: np.ndarray = np.ones(1)
+            self.walltime_histogram: Tuple[np.ndarray, np.ndarray] = _log_histogram(self.walltime)
+            self.cpuh_histogram: Tuple[np.ndarray, np.ndarray] = _log_histogram(self.cpuh)
 
         def update_complete(self):
             self.__draw_plot()
@@ -55,50 +75,41 @@ class RuntimeHistogramDialog(QDialog):
                 self.__currently_updating = True
                 worker = Worker(self.__update_data)
                 worker.signals.finished.connect(self.update_complete)
-                pool = QThreadPool.globalInstance()
-                pool.start(worker)
+                self.pool.start(worker)
 
         def __update_data(self, *args, **kwargs) -> None:
             calculations = self.db_manager.get_collection("calculations")
-            selection = finished_calculations()
             # Loop over all results
-            self.walltime = []
-            self.cpuh = []
-            for calculation in calculations.query_calculations(dumps(selection)):
+            walltime: List[float] = []
+            cpuh: List[float] = []
+            for calculation in calculations.query_calculations(_FINISHED_SELECTION):
                 if calculation.has_runtime():
                     cores = calculation.get_job().cores
                     runtime = calculation.get_runtime()
-                    self.walltime.append(runtime)
-                    self.cpuh.append(cores * runtime)
-
-            if not self.walltime:
-                self.walltime = [1.0]
-                self.cpuh = [1.0]
+                    walltime.append(runtime)
+                    cpuh.append(cores * runtime)
+
+            if not walltime:
+                walltime = [1.0]
+                cpuh = [1.0]
+            self.walltime = np.asarray(walltime, dtype=np.float64)
+            self.cpuh = np.asarray(cpuh, dtype=np.float64)
+            # reduce to bin counts here, the redraw in the main thread only has to draw the bars
+            self.walltime_histogram = _log_histogram(self.walltime)
+            self.cpuh_histogram = _log_histogram(self.cpuh)
 
         def __draw_plot(self):
-            min_val = np.floor(np.log10(np.min(self.walltime)))
-            max_val = np.ceil(np.log10(np.max(self.walltime)))
             self.ax1.cla()
-            self.ax1.hist(
-                self.walltime,
-                bins=10 ** np.linspace(min_val, max_val, 50),
-                log=False,
-                color="lightblue",
-            )
+            counts, edges = self.walltime_histogram
+            self.ax1.bar(edges[:-1], counts, width=np.diff(edges), align="edge", color="lightblue")
             self.ax1.set_title("Walltime", self.font)
             self.ax1.set_xlabel("Walltime in s")
             self.ax1.set_ylabel("Count")
             self.ax1.set_xscale("log")
 
-            min_val = np.floor(np.log10(np.min(self.cpuh)))
-            max_val = np.ceil(np.log10(np.max(self.cpuh)))
             self.ax2.cla()
-            self.ax2.hist(
-                self.cpuh,
-                bins=10 ** np.linspace(min_val, max_val, 50),
-                log=False,
-                color="lightblue",
-            )
+            counts, edges = self.cpuh_histogram
+            self.ax2.bar(edges[:-1], counts, width=np.diff(edges), align="edge", color="lightblue")
             self.ax2.set_title("CPU Time", self.font)
             self.ax2.set_xlabel("CPU Time in s")
             self.ax2.set_ylabel("Count")
@@ -129,29 +140,29 @@ class RuntimeHistogramDialog(QDialog):
             self.setText("Querying database...")
             self.repaint()  # required to update mid-function
             calculations = self.db_manager.get_collection("calculations")
-            selection = finished_calculations()
-            n_calcs = calculations.count(dumps(selection))
+            # one traversal each for the finished and the pending calculations
+            runtime_sum = 0.0
+            n_calcs = 0
+            for calculation in calculations.query_calculations(_FINISHED_SELECTION):
+                n_calcs += 1
+                if calculation.runtime is not None:
+                    runtime_sum += calculation.runtime
             if n_calcs == 0:
                 self.setText("No finished calculations so far")
                 return
-            avg_wall_time = sum(
-                c.runtime for c in calculations.query_calculations(dumps(selection)) if c.runtime is not None
-            )
-            avg_wall_time = timedelta(seconds=(avg_wall_time / n_calcs))
+            avg_wall_time = timedelta(seconds=(runtime_sum / n_calcs))
             text = (
                 f"Total walltime so far: {timedelta_string(avg_wall_time * n_calcs)} \n"
                 + f"Average walltime per job: {timedelta_string(avg_wall_time)} \n"
             )
-            n_pending = calculations.count(dumps({"status": "pending"}))
+            cores_sum = 0
+            n_pending = 0
+            for calculation in calculations.query_calculations(_PENDING_SELECTION):
+                n_pending += 1
+                cores_sum += calculation.get_job().cores
             if n_pending > 0:
-                avg_cores_for_pending = sum(
-                    c.get_job().cores
-                    for c in calculations.query_calculations(
-                        dumps({"status": "pending"})
-                    )
-                )
-                avg_cores_for_pending /= n_pending
-                n_todo = calculations.count(dumps(unstarted_calculations()))
+                avg_cores_for_pending = cores_sum / n_pending
+                n_todo = calculations.count(_UNSTARTED_SELECTION)
                 walltime_left = (
                     (n_todo + n_pending) * avg_wall_time * avg_cores_for_pending / n_pending
                 )
@@ -170,9 +181,13 @@ class RuntimeHistogramDialog(QDialog):
         super(RuntimeHistogramDialog, self).__init__(parent)
         self.setWindowTitle(window_title)
 
+        # own pool, so that database queries of the dialog do not compete with the rest of the application
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+
         # Create layout and add widgets
         layout = QVBoxLayout()
-        self.chart = self.Chart(db_manager)
+        self.chart = self.Chart(db_manager, self._pool)
         layout.addWidget(self.chart)
         self.info_text = self.InfoText(db_manager)
         layout.addWidget(self.info_text)
@@ -16,17 +16,17 @@ class DummyType(type):
 
 
 class DummyClass(metaclass=DummyType):
+    __slots__ = ("cls",)
 
     def __init__(self, *args, **kwargs):
-        self.cls = None
+        # __setattr__ is disabled, so the slot has to be filled explicitly
+        object.__setattr__(self, "cls", None)
 
     def __getattribute__(self, item):
         if item == "__class__":
             return object.__getattribute__(self, "__class__")
-        try:
-            return object.__getattribute__(self, "cls")
-        except AttributeError:
-            return object.__getattribute__(self, "__class__")
+        cls = object.__getattribute__(self, "cls")
+        return cls if cls is not None else object.__getattribute__(self, "__class__")
 
     def __setattr__(self, key, value):
         pass
@@ -50,6 +50,7 @@ class NotMatchingClass(DummyClass):
     that is an optional dependency and is not installed.
     Its main task is to not match any types in type checks.
     """
+    __slots__ = ()
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -61,6 +62,7 @@ class AnyMatchingClass(DummyClass):
     Same idea as NotMatchClass, but with the idea to match every type check.
     However, any returned variables did work as typehints for mypy, so currently unused.
     """
+    __slots__ = ()
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -25,10 +25,27 @@ def collision(
     return res
 
 
+def collision_any(
+    radius: float, position: np.ndarray, radii: np.ndarray, positions: np.ndarray
+) -> bool:
+    """
+    Checks whether a sphere collides with any sphere
+    given by an array of radii of shape (n,)
+    and an array of positions of shape (n, 3).
+    """
+    squared_distances = ((positions - position) ** 2).sum(axis=1)
+    return bool(np.any(squared_distances < (radii + radius) ** 2))
+
+
 def collision_multiple(
     radius: float, position: Position, radii: List[float], positions: List[Position]
 ) -> bool:
     """
     Checks whether a sphere collides with any sphere in a list.
     """
-    return any(collision(radius, position, r, p) for r, p in zip(radii, positions))
+    return collision_any(
+        radius,
+        np.asarray(position, dtype=float),
+        np.asarray(radii, dtype=float),
+        np.asarray(positions, dtype=float).reshape((-1, 3)),
+    )
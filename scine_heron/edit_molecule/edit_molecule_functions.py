@@ -29,9 +29,10 @@ def build_molecule_without_removed_atoms(
     Creates a new molecule copying all the atoms
     except the one with the given id.
     """
+    removed = frozenset(id_atoms_to_remove)
     new_molecule = vtkMolecule()
     for i in range(old_molecule.GetNumberOfAtoms()):
-        if i not in id_atoms_to_remove:
+        if i not in removed:
             old_atom = old_molecule.GetAtom(i)
             _add_atom_to_molecule(
                 new_molecule, old_atom.GetAtomicNumber(), old_atom.GetPosition()
@@ -65,15 +66,18 @@ def _build_molecule_with_new_atom(
     new_atomic_number: int,
     positioning_strategy: Callable[[vtkMolecule, int], Position],
 ) -> vtkMolecule:
-
-    new_molecule = vtkMolecule()
-    new_molecule.DeepCopy(old_molecule)
-
-    new_position = positioning_strategy(new_molecule, new_atomic_number)
+    """
+    Returns a copy of the molecule with the new atom added at the position
+    given by the strategy, or the unchanged old molecule if the strategy
+    does not find a position.
+    """
+    new_position = positioning_strategy(old_molecule, new_atomic_number)
 
     if new_position is None:
-        return new_molecule
+        return old_molecule
 
+    new_molecule = vtkMolecule()
+    new_molecule.DeepCopy(old_molecule)
     _add_atom_to_molecule(new_molecule, new_atomic_number, new_position)
 
     return new_molecule
@@ -12,10 +12,12 @@ from scine_utilities import (
 )
 
 from vtk import vtkMolecule
+from vtk.util.numpy_support import vtk_to_numpy
 import numpy as np
+from functools import lru_cache
 from typing import List, Optional, Callable, Tuple, Dict, Any
 
-from scine_heron.edit_molecule.collision import collision_multiple
+from scine_heron.edit_molecule.collision import collision_any
 
 import itertools
 
@@ -25,17 +27,32 @@ def _create_writeable_candidates(n: int) -> List[np.ndarray]:
     Creates `n` np arrays, writable, of shape (3,1),
     to use as output for the methods of StructuralCompletion.
     """
-    # Each array must be a different object in memory
-    pos_candidates = [np.zeros((3, 1)) for _ in range(n)]
-    for c in pos_candidates:
-        c.setflags(write=True)
-    return pos_candidates
+    # Each array must be a different object in memory,
+    # views into a single buffer fulfill this with one allocation
+    buffer = np.zeros((n, 3, 1))
+    return [buffer[i] for i in range(n)]
 
 
+@lru_cache(maxsize=128)
 def _get_covalent_radius(z: int) -> float:
     return ElementInfo.covalent_radius(ElementInfo.element(z)) * ANGSTROM_PER_BOHR
 
 
+@lru_cache(maxsize=64)
+def _visual_radii(other_ns: Tuple[int, ...], new_n: int, safety_margin: float) -> Tuple[float, np.ndarray]:
+    """
+    Returns the visual radius of the new atom and of all other atoms.
+    Cached, because the same molecule is typically edited several times in a row.
+    """
+    visual_radius_new_atom = safety_margin * _get_covalent_radius(new_n)
+    visual_radii = safety_margin * np.array([
+        _get_covalent_radius(n) for n in other_ns
+    ], dtype=float)
+    # shared between calls
+    visual_radii.setflags(write=False)
+    return visual_radius_new_atom, visual_radii
+
+
 def _create_molecule_validator(
         new_n: int, molecule: vtkMolecule
 ) -> Callable[[np.ndarray], bool]:
@@ -49,23 +66,16 @@ def _create_molecule_validator(
     # having a radius of .3,
     SAFETY_MARGIN = 0.35
 
-    other_positions = [
-        molecule.GetAtom(i).GetPosition()  # Do not reformat
-        for i in range(molecule.GetNumberOfAtoms())
-    ]
-    other_ns = [
-        molecule.GetAtom(i).GetAtomicNumber()  # Do not reformat
-        for i in range(molecule.GetNumberOfAtoms())
-    ]
+    # Read all atoms at once instead of querying them one by one
+    other_positions = vtk_to_numpy(
+        molecule.GetAtomicPositionArray().GetData()
+    ).astype(float).reshape((-1, 3))
+    other_ns = vtk_to_numpy(molecule.GetAtomicNumberArray()).tolist()
 
-    visual_radius_new_atom = SAFETY_MARGIN * _get_covalent_radius(new_n)
-    visual_radii = [
-        SAFETY_MARGIN * _get_covalent_radius(n) for n in other_ns
-    ]
+    visual_radius_new_atom, visual_radii = _visual_radii(tuple(other_ns), new_n, SAFETY_MARGIN)
 
     def validator(position: np.ndarray) -> bool:
-        assert position.shape == (3,)
-        return not collision_multiple(
+        return not collision_any(
             radius=visual_radius_new_atom,
             position=position,
             radii=visual_radii,
@@ -86,18 +96,23 @@ def _get_pos_array(atom_id: int, molecule: vtkMolecule) -> np.ndarray:
     return np.array(pos).reshape((3, 1))
 
 
+# Positions on the faces, edges and corners of a cube of side 2,
+# sorted by distance to the center, skipping the center itself
+_LATTICE_SUGGESTIONS = np.asarray(
+    sorted(
+        itertools.product([-1, 0, 1], repeat=3),  # producing a lattice
+        key=lambda v: sum(x * x for x in v),
+    )[1:],  # sort by distance
+    dtype=float,
+)
+
+
 def generate_random_position_around_atom(*positions: np.ndarray) -> None:
     """
     Produces positions on the faces, edges and corners of a cube of side 2,
     sorted by distance to the center.
     """
-    xs = ys = zs = [-1, 0, 1]
-    suggestions = sorted(
-        itertools.product(xs, ys, zs),  # producing a lattice
-        key=lambda v: sum(x * x for x in v),
-    )  # sort by distance
-    # Skipping the centre
-    for pos, suggestion in zip(positions, suggestions[1:]):
+    for pos, suggestion in zip(positions, _LATTICE_SUGGESTIONS):
         # assigning to output arrays
         pos[:, 0] = suggestion
 
@@ -141,10 +156,7 @@ def new_atom_position_from_id_list(
 
     # Unique but preserving order
     # (which set() does not do)
-    unique_atom_ids = []
-    for atom_id in atom_ids:
-        if atom_id not in unique_atom_ids:
-            unique_atom_ids.append(atom_id)
+    unique_atom_ids = list(dict.fromkeys(atom_ids))
 
     number_of_bonds = len(unique_atom_ids) - 1
     if number_of_bonds not in completion_functions_to_try.keys():
@@ -164,29 +176,23 @@ def new_atom_position_from_id_list(
     def position_to_displacement(position: np.ndarray) -> np.ndarray:
         return position - known_positions[0]
 
-    def displacement_to_position(displacement: np.ndarray) -> np.ndarray:
-        return displacement + known_positions[0]
-
-    def rescale_safe(displacement: np.ndarray) -> np.ndarray:
-        length = np.sqrt(np.sum(displacement ** 2))
-        if length == 0:
-            return displacement  # We give up
-        return displacement * safety_distance / length
-
     known_displacements = [position_to_displacement(p) for p in known_positions[1:]]
+    if any(not d.any() for d in known_displacements):
+        # A bonded atom sits on top of the base atom, all candidates
+        # built from its bond would coincide with the base atom
+        number_of_bonds = 0
+        known_displacements = []
 
     for function, n_position_candidates in completion_functions_to_try[number_of_bonds]:
         displacement_candidates = _create_writeable_candidates(n_position_candidates)
         function(*known_displacements, *displacement_candidates)
-        displacement_candidates_rescaled = [
-            rescale_safe(d) for d in displacement_candidates
-        ]
-
-        position_candidates = [
-            displacement_to_position(d) for d in displacement_candidates_rescaled
-        ]
+        # rescale all candidates to the safety distance at once
+        displacements = np.stack([d.reshape((3,)) for d in displacement_candidates])
+        lengths = np.linalg.norm(displacements, axis=1, keepdims=True)
+        lengths[lengths == 0] = safety_distance  # We give up on zero-length displacements
+        position_candidates = displacements * safety_distance / lengths + known_positions[0].reshape((3,))
         for candidate in position_candidates:
-            if validator(candidate.reshape((3,))):
-                return candidate, function.__name__
+            if validator(candidate):
+                return candidate.reshape((3, 1)), function.__name__
 
     return default_result
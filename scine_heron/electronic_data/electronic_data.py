@@ -7,12 +7,15 @@ See LICENSE.txt for details.
 """
 Provides the ElectronicData class.
 """
-import re
 import math
 import numpy as np
-from typing import List, Any
+from typing import List, Any, Union
 from scine_heron.molecule.utils.molecule_utils import times_angstrom_per_bohr
 
+# supported atomic orbital types, ordered by angular momentum
+ORBITAL_TYPES = ("s", "p", "d", "f")
+_PI_CUBED = math.pi ** 3
+
 
 class MolecularOrbital:
     """
@@ -25,7 +28,7 @@ class MolecularOrbital:
         energy: float,
         spin: str,
         occupation: float,
-        coefficients: List[float],
+        coefficients: Union[List[float], np.ndarray],
     ):
         self.symmetry = symmetry
         self.energy = energy
@@ -35,17 +38,23 @@ class MolecularOrbital:
 
     @classmethod
     def from_molden_file(cls, lines: List[str]) -> Any:
-        symmetry = re.match(r"\s?Sym(?:.*)=(.*)", lines[0]).groups()[0].strip()  # type: ignore[union-attr]
-        energy = float(
-            re.match(  # type: ignore[union-attr]
-                r"\s?Ene(?:.*)=(.*)",
-                lines[1]).groups()[0].strip())  # type: ignore[union-attr]
-        spin = re.match(r"\s?Spin(?:.*)=(.*)", lines[2]).groups()[0].strip()  # type: ignore[union-attr]
-        occupation = float(
-            re.match(  # type: ignore[union-attr]
-                r"\s?Occup(?:.*)=(.*)",
-                lines[3]).groups()[0].strip())  # type: ignore[union-attr]
-        coefficients = [float(line.split()[1]) for line in lines[4:] if len(line) > 0]
+        rows = [line for line in lines[4:] if len(line) > 0]
+        values = " ".join(rows).split()
+        if len(values) == 2 * len(rows):
+            # regular "index coefficient" rows, take every second value
+            coefficients = np.array(values[1::2], dtype=float)
+        else:
+            coefficients = np.array([row.split()[1] for row in rows], dtype=float)
+
+        return cls.from_molden_header(lines[:4], coefficients)
+
+    @classmethod
+    def from_molden_header(cls, header: List[str], coefficients: np.ndarray) -> Any:
+        # the value follows the last '=' of each header line
+        symmetry = header[0].rpartition("=")[2].strip()
+        energy = float(header[1].rpartition("=")[2])
+        spin = header[2].rpartition("=")[2].strip()
+        occupation = float(header[3].rpartition("=")[2])
 
         return cls(symmetry, energy, spin, occupation, coefficients)
 
@@ -55,54 +64,30 @@ class GaussianOrbital:
     Provide gaussian orbital.
     """
 
-    def __init__(self, orb_type: str, coefficients: List[List[float]]):
+    def __init__(self, orb_type: str, coefficients: Union[List[List[float]], np.ndarray]):
         self.orb_type = orb_type
+        if orb_type not in ORBITAL_TYPES:
+            raise NotImplementedError(
+                "The atomic orbital type '" + orb_type + "' is not implemented."
+            )
+        # angular momentum quantum number, 0 for s, 1 for p, ...
+        self.orb_type_int = ORBITAL_TYPES.index(orb_type)
+        # number of spherical components [5D] [7F]
+        self.__chi_step = 2 * self.orb_type_int + 1
         self.nr_gaussians = len(coefficients)
 
-        self.coefficients = coefficients
-        self.alpha = np.array([coefficients[i][0] for i in range(self.nr_gaussians)])
-        self.coeff = np.array(
-            [
-                self.__calculate_coefficients(i, orb_type)
-                for i in range(self.nr_gaussians)
-            ]
-        )
+        # one (exponent, contraction coefficient) pair per primitive
+        primitives = np.asarray(coefficients, dtype=float).reshape((-1, 2))
+        self.coefficients = primitives.tolist()
+        self.alpha = primitives[:, 0]
+        # normalization of the primitives, (2^(4l+3) alpha^(2l+3) / pi^3)^(1/4)
+        normalization = np.sqrt(np.sqrt(
+            2.0 ** (4 * self.orb_type_int + 3) * self.alpha ** (2 * self.orb_type_int + 3) / _PI_CUBED
+        ))
+        self.coeff = primitives[:, 1] * normalization
 
     def chi_step(self) -> int:
-        if self.orb_type == "s":  # s orbital
-            return 1
-        elif self.orb_type == "p":  # p orbital
-            return 3
-        elif self.orb_type == "d":  # d orbital [5D]
-            return 5
-        elif self.orb_type == "f":  # f orbital [7F]
-            return 7
-        else:
-            raise NotImplementedError(
-                "The atomic orbital type '" + self.orb_type + "' is not implemented."
-            )
-
-    def __calculate_coefficients(self, index: int, orb_type: str) -> float:
-        if self.orb_type == "s":  # s orbital
-            return self.coefficients[index][1] * pow(
-                2.0 * self.alpha[index] / math.pi, 0.75
-            )
-        elif self.orb_type == "p":  # p orbital
-            return self.coefficients[index][1] * pow(
-                128.0 * pow(self.alpha[index], 5) / pow(math.pi, 3), 0.25
-            )
-        elif self.orb_type == "d":  # d orbital
-            return self.coefficients[index][1] * pow(
-                2048.0 * pow(self.alpha[index], 7) / pow(math.pi, 3), 0.25
-            )
-        elif self.orb_type == "f":  # f orbital
-            return self.coefficients[index][1] * pow(
-                32768.0 * pow(self.alpha[index], 9) / pow(math.pi, 3), 0.25
-            )
-        else:
-            raise NotImplementedError(
-                "The atomic orbital type '" + orb_type + "' is not implemented."
-            )
+        return self.__chi_step
 
 
 class Atom:
@@ -9,15 +9,70 @@ Provides the ElectronicDataImageGenerator class.
 """
 
 import math
+import os
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
-from typing import List, Dict
+from typing import List
 import scine_utilities as su
 from vtk import (
     vtkImageData,
     VTK_DOUBLE,
 )
+from vtk.util.numpy_support import vtk_to_numpy
+from scipy.spatial import cKDTree
 from scine_heron.electronic_data.electronic_data import ElectronicData
 
+# the grid is only used for isosurfaces, single precision is sufficient
+# and halves the memory traffic of the evaluation
+_GRID_DTYPE = np.float32
+
+
+def _write_orbital_components(
+    orb_type: int, radial_sum: np.ndarray, xa: np.ndarray, ya: np.ndarray, za: np.ndarray, out: np.ndarray
+) -> None:
+    """
+    Writes the spherical components of an atomic orbital with
+    angular momentum `orb_type` into the columns of `out`.
+    `radial_sum` holds the radial part and `xa`, `ya`, `za` the distances
+    to the atom in bohr for each grid point.
+    """
+    if orb_type == 0:  # s orbital
+        out[:, 0] = radial_sum
+        return
+    if orb_type == 1:  # p orbital
+        np.multiply(xa, radial_sum, out=out[:, 0])
+        np.multiply(ya, radial_sum, out=out[:, 1])
+        np.multiply(za, radial_sum, out=out[:, 2])
+        return
+    xa2 = xa * xa
+    ya2 = ya * ya
+    za2 = za * za
+    # shared factors are computed once and the products are written in place
+    if orb_type == 2:  # d orbital [5D]
+        np.multiply(0.288675135 * (2 * za2 - xa2 - ya2), radial_sum, out=out[:, 0])
+        np.multiply(0.5 * (xa2 - ya2), radial_sum, out=out[:, 1])
+        x_radial = xa * radial_sum
+        np.multiply(x_radial, ya, out=out[:, 2])
+        np.multiply(x_radial, za, out=out[:, 3])
+        np.multiply(ya * za, radial_sum, out=out[:, 4])
+    elif orb_type == 3:  # f orbital [7F]
+        ra2 = xa2 + ya2 + za2
+        za2_5 = 5.0 * za2
+        radial_x = radial_sum * xa
+        radial_z = radial_sum * za
+        np.multiply(radial_z, za2_5 - 3.0 * ra2, out=out[:, 0])
+        za2_5 -= ra2
+        np.multiply(radial_x, za2_5, out=out[:, 1])
+        np.multiply(radial_sum * ya, za2_5, out=out[:, 2])
+        np.multiply(radial_z, xa2 - ya2, out=out[:, 3])
+        np.multiply(radial_x * ya, za, out=out[:, 4])
+        np.multiply(radial_sum, xa * xa2 - 3.0 * xa * ya2, out=out[:, 5])
+        np.multiply(radial_sum, 3.0 * xa2 * ya - ya2 * ya, out=out[:, 6])
+    else:
+        raise NotImplementedError(
+            "The atomic orbital type '" + str(orb_type) + "' is not implemented."
+        )
+
 
 class ElectronicDataImageGenerator:
     """
@@ -30,8 +85,9 @@ class ElectronicDataImageGenerator:
         self.__block_size = 8
         self.__threshold = 1e-2
         self.__step_size = 0.2
+        self.__n_threads = min(8, os.cpu_count() or 1)
+        self.__build_orbital_arrays()
         self.__dim = self.__get_box_size()
-        self.__cache: Dict[int, np.ndarray] = dict()
         self.__steps = [
             int((self.__dim[1] - self.__dim[0]) / self.__step_size + 0.5),
             int((self.__dim[3] - self.__dim[2]) / self.__step_size + 0.5),
@@ -42,41 +98,53 @@ class ElectronicDataImageGenerator:
             (self.__dim[3] - self.__dim[2]) / (self.__steps[1] - 1),
             (self.__dim[5] - self.__dim[4]) / (self.__steps[2] - 1),
         )
+        # atoms are kept for a block, if the nearest grid point is within 1 bohr
+        # or within the range of the most diffuse primitive of the atom
+        self.__atom_cutoff2 = np.maximum(1.0, -math.log(self.__threshold) / self.__atom_min_alpha)
+        block_extent = (self.__block_size - 1) * np.array([self.__dx, self.__dy, self.__dz])
+        self.__block_extent = block_extent
+        self.__block_half_extent = block_extent / 2
+        self.__atom_search_radius = (
+            math.sqrt(self.__atom_cutoff2.max()) * su.ANGSTROM_PER_BOHR + np.linalg.norm(self.__block_half_extent)
+        )
+        self.__atom_tree = cKDTree(self.__atom_coordinates)
+
+    def __build_orbital_arrays(self) -> None:
+        """
+        Collects the atom and orbital data into contiguous arrays,
+        so that the grid evaluation does not have to walk the python objects.
+        Orbitals with fewer primitives are padded with zero coefficients.
+        """
+        atoms = self.__electronic_data.atoms
+        self.__atom_coordinates = np.array([atom.coordinates for atom in atoms], dtype=float).reshape((-1, 3))
+        self.__atom_min_alpha = np.array([atom.min_alpha for atom in atoms], dtype=float)
+        self.__atom_orbital_start = np.cumsum([0] + [len(atom.gaussian_orbitals) for atom in atoms])
+
+        orbitals = [orbital for atom in atoms for orbital in atom.gaussian_orbitals]
+        max_gaussians = max((orbital.nr_gaussians for orbital in orbitals), default=0)
+        self.__orbital_alpha = np.zeros((len(orbitals), max_gaussians))
+        self.__orbital_coeff = np.zeros((len(orbitals), max_gaussians))
+        for index, orbital in enumerate(orbitals):
+            self.__orbital_alpha[index, :orbital.nr_gaussians] = orbital.alpha
+            self.__orbital_coeff[index, :orbital.nr_gaussians] = orbital.coeff
+        # squared distance beyond which an orbital is certainly below the threshold,
+        # from sum(c * exp(-r2 * alpha)) <= sum(|c|) * exp(-r2 * min(alpha))
+        self.__orbital_cutoff2 = np.array([
+            max(0.0, math.log(np.abs(orbital.coeff).sum() / self.__threshold)) / np.min(orbital.alpha)
+            if orbital.nr_gaussians > 0 else -np.inf
+            for orbital in orbitals
+        ])
+        self.__orbital_types = np.array([orbital.orb_type_int for orbital in orbitals], dtype=int)
+        # column of the first spherical component of each orbital in the basis matrix
+        self.__orbital_chi_offset = np.cumsum([0] + [orbital.chi_step() for orbital in orbitals])
+        # one column per molecular orbital
+        self.__mo_coefficients = np.array([mo.coefficients for mo in self.__electronic_data.mo], dtype=_GRID_DTYPE).T
 
     def __get_box_size(self) -> List[float]:
-        x = np.array(
-            [
-                self.__electronic_data.atoms[index].coordinates[0]
-                for index in range(len(self.__electronic_data.atoms))
-            ]
-        )
-        y = np.array(
-            [
-                self.__electronic_data.atoms[index].coordinates[1]
-                for index in range(len(self.__electronic_data.atoms))
-            ]
-        )
-        z = np.array(
-            [
-                self.__electronic_data.atoms[index].coordinates[2]
-                for index in range(len(self.__electronic_data.atoms))
-            ]
-        )
-        borders = np.array(
-            [
-                np.sqrt(-np.log(self.__threshold * 10) / atom.min_alpha)
-                for atom in self.__electronic_data.atoms
-            ]
-        )
-        box = [
-            min(x - borders),
-            max(x + borders),
-            min(y - borders),
-            max(y + borders),
-            min(z - borders),
-            max(z + borders),
-        ]
-        return box
+        borders = np.sqrt(-np.log(self.__threshold * 10) / self.__atom_min_alpha)[:, None]
+        lower = (self.__atom_coordinates - borders).min(axis=0)
+        upper = (self.__atom_coordinates + borders).max(axis=0)
+        return [lower[0], upper[0], lower[1], upper[1], lower[2], upper[2]]
 
     def generate_mo_image(self, orbital_index: int) -> vtkImageData:
         """
@@ -88,78 +156,85 @@ class ElectronicDataImageGenerator:
         image.SetSpacing(self.__dx, self.__dy, self.__dz)
         image.AllocateScalars(VTK_DOUBLE, 1)
         image.GetPointData().GetScalars().Fill(0.0)
+        # writable view on the image data, vtk stores the x index fastest
+        scalars = vtk_to_numpy(image.GetPointData().GetScalars()).reshape(
+            (self.__steps[2], self.__steps[1], self.__steps[0])
+        )
 
-        block_index = 0
-        i = 0
+        # the slabs of blocks along x are independent and write to disjoint parts of the image
+        slabs = []
         x = self.__dim[0]
-        while i < self.__steps[0]:
-            j = 0
-            y = self.__dim[2]
-            while j < self.__steps[1]:
-                k = 0
-                z = self.__dim[4]
-                while k < self.__steps[2]:
-                    block = None
+        for i in range(0, self.__steps[0], self.__block_size):
+            slabs.append((i, x))
+            x += self.__dx * self.__block_size
+        with ThreadPoolExecutor(self.__n_threads) as executor:
+            futures = [
+                executor.submit(self.__add_slab_at_image, scalars, orbital_index, i, x)
+                for i, x in slabs
+            ]
+            for future in futures:
+                future.result()
+        image.GetPointData().GetScalars().Modified()
+        return image
+
+    def __add_slab_at_image(
+        self, scalars: np.ndarray, orbital_index: int, i: int, x: float
+    ) -> None:
+        """
+        Evaluates all blocks starting at grid index `i` along x and copies them into the image.
+        """
+        # significant basis functions on the grid points of the current block, reused for all blocks of the slab
+        chi = np.empty((self.__block_size ** 3, self.__orbital_chi_offset[-1]), dtype=_GRID_DTYPE)
+        # distances along x and y only change with the slab and the row of blocks
+        grid_x = self.__grid_distances(x, self.__dx, 0)
+        j = 0
+        y = self.__dim[2]
+        while j < self.__steps[1]:
+            grid_y = self.__grid_distances(y, self.__dy, 1)
+            k = 0
+            z = self.__dim[4]
+            while k < self.__steps[2]:
+                columns = self.__calc_basis_at_block(chi, grid_x, grid_y, x, y, z)
+                # blocks far away from all atoms stay zero and need no contraction
+                if len(columns) > 0:
+                    significant_chi = chi[:, :len(columns)]
                     if orbital_index == -4:
                         # Electron Density
-                        for orb in self.__electronic_data.mo:
-                            coefficients_size = len(orb.coefficients)
-                            if block_index not in self.__cache:
-                                self.__calc_mo_at_block_and_save_in_cache(
-                                    block_index, coefficients_size, x, y, z
-                                )
-                            block_tmp = self.__cache[block_index].dot(orb.coefficients)
-                            block_tmp = np.square(block_tmp)
-                            try:
-                                block += block_tmp
-                            except BaseException:
-                                block = block_tmp
+                        psi = significant_chi.dot(self.__mo_coefficients[columns])
+                        block = np.einsum("ij,ij->i", psi, psi)
                     else:
-                        mo = self.__electronic_data.mo[orbital_index]
-                        coefficients_size = len(mo.coefficients)
-                        if block_index not in self.__cache:
-                            self.__calc_mo_at_block_and_save_in_cache(
-                                block_index, coefficients_size, x, y, z
-                            )
-                        block = self.__cache[block_index].dot(mo.coefficients)
-                    if block is not None and np.sum(np.abs(block)) > 1.0e-4:
-                        self.__add_mo_block_at_image(image, block, i, j, k)
+                        block = significant_chi.dot(self.__mo_coefficients[columns, orbital_index])
+                    if np.sum(np.abs(block)) > 1.0e-4:
+                        self.__add_mo_block_at_image(scalars, block, i, j, k)
 
-                    k += self.__block_size
-                    z += self.__dz * self.__block_size
-                    block_index += 1
-                j += self.__block_size
-                y += self.__dy * self.__block_size
-            i += self.__block_size
-            x += self.__dx * self.__block_size
-        return image
+                k += self.__block_size
+                z += self.__dz * self.__block_size
+            j += self.__block_size
+            y += self.__dy * self.__block_size
 
     def __add_mo_block_at_image(
         self,
-        image: vtkImageData,
+        scalars: np.ndarray,
         block: np.ndarray,
         origin_i: int,
         origin_j: int,
         origin_k: int,
     ) -> None:
-        index = 0
-        for i in range(self.__block_size):
-            for j in range(self.__block_size):
-                for k in range(self.__block_size):
-                    if (
-                        origin_i + i < self.__steps[0]
-                        and origin_j + j < self.__steps[1]
-                        and origin_k + k < self.__steps[2]
-                    ):
-                        if block[index] != 0.0:
-                            image.SetScalarComponentFromDouble(
-                                origin_i + i,
-                                origin_j + j,
-                                origin_k + k,
-                                0,
-                                block[index],
-                            )
-                        index += 1
+        """
+        Copies the block into the image scalars, given as array in (k, j, i) order,
+        cropping it at the borders of the image.
+        """
+        size = self.__block_size
+        values = block.reshape((size, size, size))[
+            :self.__steps[0] - origin_i,
+            :self.__steps[1] - origin_j,
+            :self.__steps[2] - origin_k,
+        ]
+        scalars[
+            origin_k:origin_k + size,
+            origin_j:origin_j + size,
+            origin_i:origin_i + size,
+        ] = values.transpose()
 
     def __nearest_value_in_list(
         self, atom_value: float, block_value: float, step: float
@@ -172,33 +247,44 @@ class ElectronicDataImageGenerator:
         else:
             return block_value + int(((atom_value - block_value) / step) + 0.5) * step
 
-    def __calc_mo_at_block_and_save_in_cache(
-        self, block_index: int, coefficients_size: int, x: float, y: float, z: float,
-    ) -> None:
+    def __grid_distances(self, start: float, step: float, axis: int) -> np.ndarray:
         """
-        Calculate the MO value at given point.
+        Returns the distances in bohr along the given axis between all atoms
+        and the grid points of a block starting at `start`, with shape (atoms, block size).
         """
-        chi_index = 0
-        self.__cache[block_index] = np.zeros(
-            (
-                self.__block_size * self.__block_size * self.__block_size,
-                coefficients_size,
-            )
-        )
-        block = self.__cache[block_index].reshape(
-            (
-                self.__block_size
-                * self.__block_size
-                * self.__block_size
-                * coefficients_size
-            )
-        )
+        grid = start + np.arange(self.__block_size) * step
+        return ((grid[None, :] - self.__atom_coordinates[:, axis, None]) * su.BOHR_PER_ANGSTROM).astype(_GRID_DTYPE)
+
+    def __calc_basis_at_block(
+        self, chi: np.ndarray, grid_x: np.ndarray, grid_y: np.ndarray, x: float, y: float, z: float
+    ) -> np.ndarray:
+        """
+        Calculate the values of the basis functions on the grid points of the block
+        starting at the given point. Only the basis functions that are not screened out
+        are written, into the leading columns of `chi`.
+        `grid_x` and `grid_y` hold the distances of the block to all atoms along x and y.
+        Returns the basis function index of each written column.
+        """
+        size = self.__block_size
+        offsets = np.arange(size)
+        columns: List[np.ndarray] = []
+        n_columns = 0
 
-        for atom in self.__electronic_data.atoms:
-            atom_x = atom.coordinates[0]
-            atom_y = atom.coordinates[1]
-            atom_z = atom.coordinates[2]
+        # only atoms close to the block can pass the screening below
+        block_origin = np.array([x, y, z])
+        nearby_atoms = self.__atom_tree.query_ball_point(block_origin + self.__block_half_extent,
+                                                         self.__atom_search_radius)
+        if not nearby_atoms:
+            return np.empty(0, dtype=int)
+        atom_indices = np.array(sorted(nearby_atoms), dtype=int)
+        # drop atoms whose cutoff does not reach the bounding box of the block, all at once
+        atom_coordinates = self.__atom_coordinates[atom_indices]
+        offset = atom_coordinates - np.clip(atom_coordinates, block_origin, block_origin + self.__block_extent)
+        box_distance2 = np.square(offset * su.BOHR_PER_ANGSTROM).sum(axis=1)
+        atom_indices = atom_indices[box_distance2 <= self.__atom_cutoff2[atom_indices]]
 
+        for atom_index in atom_indices:
+            atom_x, atom_y, atom_z = self.__atom_coordinates[atom_index]
             nearest_x = self.__nearest_value_in_list(atom_x, x, self.__dx)
             nearest_y = self.__nearest_value_in_list(atom_y, y, self.__dy)
             nearest_z = self.__nearest_value_in_list(atom_z, z, self.__dz)
@@ -214,78 +300,45 @@ class ElectronicDataImageGenerator:
             )
 
             if ra2_nearest > 1:
-                if math.exp(-ra2_nearest * atom.min_alpha) < self.__threshold:
-                    chi_index += atom.sum_chi_step
+                if math.exp(-ra2_nearest * self.__atom_min_alpha[atom_index]) < self.__threshold:
                     continue
 
-            for orbital in atom.gaussian_orbitals:
-                if ra2_nearest > 1:
-                    if (
-                        np.dot(orbital.coeff, np.exp(-ra2_nearest * orbital.alpha))
-                        < self.__threshold
-                    ):
-                        chi_index += orbital.chi_step()
-                        continue
-
-                for i in range(self.__block_size):
-                    xx = x + (i * self.__dx)
-                    xa = (xx - atom_x) * su.BOHR_PER_ANGSTROM
-                    xa2 = xa * xa
-                    iOff = i * self.__block_size
-
-                    for j in range(self.__block_size):
-                        yy = y + (j * self.__dy)
-                        ya = (yy - atom_y) * su.BOHR_PER_ANGSTROM
-                        ya2 = ya * ya
-                        ijOff = (iOff + j) * self.__block_size
-
-                        for k in range(self.__block_size):
-                            zz = z + (k * self.__dz)
-                            za = (zz - atom_z) * su.BOHR_PER_ANGSTROM
-                            za2 = za * za
-                            ijkOff = (ijOff + k) * coefficients_size + chi_index
-
-                            ra2 = xa2 + ya2 + za2
-
-                            radial_sum = np.dot(
-                                orbital.coeff, np.exp(-ra2 * orbital.alpha)
-                            )
+            orbital_indices = np.arange(self.__atom_orbital_start[atom_index],
+                                        self.__atom_orbital_start[atom_index + 1])
+            if ra2_nearest > 1:
+                # orbitals beyond their cutoff are skipped without evaluating exponentials
+                orbital_indices = orbital_indices[ra2_nearest <= self.__orbital_cutoff2[orbital_indices]]
+            alpha = self.__orbital_alpha[orbital_indices]
+            coeff = self.__orbital_coeff[orbital_indices]
+            if ra2_nearest > 1:
+                # screen the remaining orbitals of the atom with one exponential
+                significant = np.einsum("og,og->o", coeff, np.exp(-ra2_nearest * alpha)) >= self.__threshold
+                orbital_indices = orbital_indices[significant]
+                alpha = alpha[significant]
+                coeff = coeff[significant]
+                if len(orbital_indices) == 0:
+                    continue
 
-                            if radial_sum < self.__threshold:
-                                continue
+            # distances of all grid points of the block to the atom,
+            # flattened in the same (i, j, k) order as the block
+            grid_z = (((z + offsets * self.__dz) - atom_z) * su.BOHR_PER_ANGSTROM).astype(_GRID_DTYPE)
+            xa = np.broadcast_to(grid_x[atom_index, :, None, None], (size, size, size)).ravel()
+            ya = np.broadcast_to(grid_y[atom_index, None, :, None], (size, size, size)).ravel()
+            za = np.broadcast_to(grid_z[None, None, :], (size, size, size)).ravel()
+            ra2 = xa * xa + ya * ya + za * za
 
-                            if orbital.orb_type == "s":  # s orbital
-                                block[ijkOff] = radial_sum
-                            elif orbital.orb_type == "p":  # p orbital
-                                block[ijkOff] = xa * radial_sum
-                                block[ijkOff + 1] = ya * radial_sum
-                                block[ijkOff + 2] = za * radial_sum
-                            elif orbital.orb_type == "d":  # d orbital [5D]
-                                block[ijkOff] = (
-                                    0.288675135 * (2 * za2 - xa2 - ya2) * radial_sum
-                                )
-                                block[ijkOff + 1] = 0.5 * (xa2 - ya2) * radial_sum
-                                block[ijkOff + 2] = xa * ya * radial_sum
-                                block[ijkOff + 3] = xa * za * radial_sum
-                                block[ijkOff + 4] = ya * za * radial_sum
-                            elif orbital.orb_type == "f":  # f orbital [7F]
-                                block[ijkOff] = (
-                                    radial_sum * za * (5.0 * za2 - 3.0 * ra2)
-                                )
-                                block[ijkOff + 1] = radial_sum * xa * (5.0 * za2 - ra2)
-                                block[ijkOff + 2] = radial_sum * ya * (5.0 * za2 - ra2)
-                                block[ijkOff + 3] = radial_sum * za * (xa2 - ya2)
-                                block[ijkOff + 4] = radial_sum * xa * ya * za
-                                block[ijkOff + 5] = radial_sum * (
-                                    xa * xa2 - 3.0 * xa * ya2
-                                )
-                                block[ijkOff + 6] = radial_sum * (
-                                    3.0 * xa2 * ya - ya2 * ya
-                                )
-                            else:
-                                raise NotImplementedError(
-                                    "The atomic orbital type '"
-                                    + orbital.orb_type
-                                    + "' is not implemented."
-                                )
-                chi_index += orbital.chi_step()
+            # radial parts of all remaining orbitals of the atom on all grid points of the block
+            alpha = alpha.astype(_GRID_DTYPE)
+            coeff = coeff.astype(_GRID_DTYPE)
+            radial_sums = np.einsum("pog,og->po", np.exp(-ra2[:, None, None] * alpha[None, :, :]), coeff)
+            radial_sums[radial_sums < self.__threshold] = 0.0
+            for radial_sum, orbital_index in zip(radial_sums.T, orbital_indices):
+                first = self.__orbital_chi_offset[orbital_index]
+                last = self.__orbital_chi_offset[orbital_index + 1]
+                _write_orbital_components(
+                    self.__orbital_types[orbital_index], radial_sum, xa, ya, za,
+                    chi[:, n_columns:n_columns + last - first],
+                )
+                columns.append(np.arange(first, last))
+                n_columns += last - first
+        return np.concatenate(columns) if columns else np.empty(0, dtype=int)
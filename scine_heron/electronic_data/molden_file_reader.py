@@ -5,8 +5,9 @@ Copyright ETH Zurich, Department of Chemistry and Applied Biosciences, Reiher Gr
 See LICENSE.txt for details.
 """
 
+import io
 import re
-from typing import Any, List, Tuple, Optional
+from typing import Callable, List, Tuple, Optional
 
 import numpy as np
 
@@ -15,6 +16,22 @@ from scine_heron.electronic_data.electronic_data import (Atom, ElectronicData,
                                                          MolecularOrbital)
 
 
+# Section headers that switch the parser state, mapped to the section their
+# lines belong to; ``None`` ends the current section without starting another.
+_SECTION_HEADERS = {
+    "[Atoms]": "atoms",
+    "[5D]": None,
+    "[7F]": None,
+    "[9G]": None,
+    "[Charge] (Mullike)": None,
+    "[GTO]": "gto",
+    "[MO]": "mo",
+}
+# first letters of the shell lines in the [GTO] section
+_SHELL_LETTERS = frozenset("spdfgh")
+_MO_HEAD_RE = re.compile(r"\s?Sym=")
+
+
 class MoldenFileReader:
     """
     Provide molden file reader.
@@ -24,86 +41,66 @@ class MoldenFileReader:
         """
         This method read molden file and return ElectronicData.
         """
-        atoms, gto, mo = self.__parse_molden(molden)
-        parsed_atoms = self.__parse_atoms(atoms)
-        self.__parse_gto(parsed_atoms, gto)
-        mos = self.__parse_mo(mo)
-        return ElectronicData(parsed_atoms, mos)
+        atoms, gto, mo_blocks = self.__parse_molden(molden)
+        self.__parse_gto(atoms, gto)
+        mos = self.__parse_mo(mo_blocks)
+        return ElectronicData(atoms, mos)
 
-    def __parse_molden(self, molden: str) -> Tuple[List[str], List[str], List[str]]:
+    def __parse_molden(self, molden: str) -> Tuple[List[Atom], List[str], List[List[str]]]:
         """
-        This method parse molden file.
+        This method parse molden file in a single pass.
+        Atoms are parsed right away and the lines of the [MO] section are grouped per orbital.
         """
 
-        is_atom_line = False
-        is_gto_line = False
-        is_mo_line = False
-
-        atoms: List[str] = list()
+        atoms: List[Atom] = list()
         gto: List[str] = list()
-        mo: List[str] = list()
-        for line in molden.split("\n"):
-            if re.match("^" + re.escape("[Atoms]"), line):
-                is_atom_line = True
-                is_gto_line = False
-                is_mo_line = False
-                continue
-            elif re.match("^" + re.escape("[5D]"), line):
-                is_atom_line = False
-                is_gto_line = False
-                is_mo_line = False
-                continue
-            elif re.match("^" + re.escape("[7F]"), line):
-                is_atom_line = False
-                is_gto_line = False
-                is_mo_line = False
-                continue
-            elif re.match("^" + re.escape("[9G]"), line):
-                is_atom_line = False
-                is_gto_line = False
-                is_mo_line = False
-                continue
-            elif re.match("^" + re.escape("[Charge] (Mullike)"), line):
-                is_atom_line = False
-                is_gto_line = False
-                is_mo_line = False
-                continue
-            elif re.match("^" + re.escape("[GTO]"), line):
-                is_atom_line = False
-                is_gto_line = True
-                is_mo_line = False
-                continue
-            elif re.match("^" + re.escape("[MO]"), line):
-                is_atom_line = False
-                is_gto_line = False
-                is_mo_line = True
-                continue
-
-            if is_atom_line:
-                atoms.append(line)
-
-            elif is_gto_line:
-                if line.startswith("["):
+        mo_blocks: List[List[str]] = list()
+        mode: Optional[str] = None
+        # local aliases, looked up once instead of for every line
+        is_mo_head = _MO_HEAD_RE.match
+        append_atom = atoms.append
+        append_gto = gto.append
+        append_mo_block = mo_blocks.append
+        # append of the current orbital block, lines before the first orbital head are dropped
+        append_mo_line: Optional[Callable[[str], None]] = None
+        for line in io.StringIO(molden):
+            line = line.rstrip("\n")
+            if line.startswith("["):
+                header = next((h for h in _SECTION_HEADERS if line.startswith(h)), None)
+                if header is not None:
+                    mode = _SECTION_HEADERS[header]
                     continue
-                gto.append(line)
-
-            elif is_mo_line:
-                mo.append(line)
-
-        return atoms, gto, mo
-
-    def __parse_atoms(self, atoms: List[str]) -> List[Atom]:
-        return [Atom.from_molden_line(line) for line in atoms]
-
-    def __parse_mo(self, mo: List[str]) -> List[MolecularOrbital]:
+                if mode == "gto":
+                    continue
+            if mode == "mo":
+                if is_mo_head(line):
+                    block = [line]
+                    append_mo_block(block)
+                    append_mo_line = block.append
+                elif append_mo_line is not None:
+                    append_mo_line(line)
+            elif mode == "gto":
+                append_gto(line)
+            elif mode == "atoms":
+                append_atom(Atom.from_molden_line(line))
+
+        return atoms, gto, mo_blocks
+
+    def __parse_mo(self, mo_orbital_blocks: List[List[str]]) -> List[MolecularOrbital]:
         """
         This method parse MolecularOrbital.
         """
-        mo_section_heads = self.__get_section_heads_and_positions(mo, r"\s?Sym=")
-        mo_orbital_blocks = self.__split_by_sections(mo, mo_section_heads)
+        # the four header lines are followed by "index coefficient" rows
+        rows = [[line for line in block[4:] if len(line) > 0] for block in mo_orbital_blocks]
+        n_rows = [len(block_rows) for block_rows in rows]
+        values = " ".join(line for block_rows in rows for line in block_rows).split()
+        if len(values) != 2 * sum(n_rows):
+            return [MolecularOrbital.from_molden_file(block) for block in mo_orbital_blocks]
+        # convert the coefficients of all orbitals at once
+        coefficients = np.split(np.array(values[1::2], dtype=float), np.cumsum(n_rows[:-1]))
         return [
-            MolecularOrbital.from_molden_file(block)
-            for _, block in enumerate(mo_orbital_blocks)
+            MolecularOrbital.from_molden_header(block[:4], block_coefficients)
+            for block, block_coefficients in zip(mo_orbital_blocks, coefficients)
         ]
 
     # def __stupid_gto_thing(self, gtos: List[str], atoms):
@@ -147,32 +144,33 @@ class MoldenFileReader:
     #     return stupid_list, atom_numbers
 
     def __new_atoms(self, gtos: List[str], atoms):
-        re_filter = re.compile("[spdfgh]")
         gaussian_orbitals: List[GaussianOrbital] = []
-        gaussian_coeffs: List[List[float]] = []
+        # the primitive values of all shells, converted together after the scan
+        gaussian_values: List[str] = []
+        shells: List[Tuple[List[GaussianOrbital], str, int, int]] = []
+        shell_start = 0
         j = 0
         atom = atoms[0]
         orbital_type: Optional[str] = None
         new_atoms = []
         for i, line in enumerate(gtos):
+            parts = line.split()
             # last line
             if i + 1 == len(gtos):
                 assert orbital_type
-                gaussian_orbitals.append(GaussianOrbital(orbital_type, gaussian_coeffs))
+                shells.append((gaussian_orbitals, orbital_type, shell_start, len(gaussian_values)))
                 atom.gaussian_orbitals = gaussian_orbitals
                 new_atoms.append(atom)
             # found s p d f g h
-            elif re_filter.match(line.lstrip()):
+            elif parts and parts[0][0] in _SHELL_LETTERS:
                 if orbital_type:
-                    gaussian_orbitals.append(
-                        GaussianOrbital(orbital_type, gaussian_coeffs)
-                    )
-                orbital_type = line.split()[0]
-                gaussian_coeffs = []
+                    shells.append((gaussian_orbitals, orbital_type, shell_start, len(gaussian_values)))
+                orbital_type = parts[0]
+                shell_start = len(gaussian_values)
             # empty line
-            elif line.strip() == "":
+            elif not parts:
                 assert orbital_type
-                gaussian_orbitals.append(GaussianOrbital(orbital_type, gaussian_coeffs))
+                shells.append((gaussian_orbitals, orbital_type, shell_start, len(gaussian_values)))
                 atom.gaussian_orbitals = gaussian_orbitals
                 new_atoms.append(atom)
                 orbital_type = None
@@ -180,30 +178,33 @@ class MoldenFileReader:
             # atom
             elif j == 0:
                 gaussian_orbitals = []
-                atom = atoms[int(line.split()[0]) - 1]
+                atom = atoms[int(parts[0]) - 1]
                 j = 1
             # coeffs
             elif j == 1:
-                gaussian_coeffs.append([float(line.split()[0]), float(line.split()[1])])
+                gaussian_values.extend(parts[:2])
+
+        primitives = self.__parse_primitives(gaussian_values)
+        for orbitals, shell_type, start, stop in shells:
+            orbitals.append(GaussianOrbital(shell_type, primitives[start // 2: stop // 2]))
         return new_atoms
 
+    @staticmethod
+    def __parse_primitives(values: List[str]) -> np.ndarray:
+        """
+        Parse the exponents and contraction coefficients of all shells at once.
+        """
+        return np.char.replace(np.array(values, dtype=str), "D", "E").astype(float).reshape((-1, 2))
+
     def __parse_gto(self, atoms: List[Atom], gto: List[str]) -> None:
         """
         This method parse AtomicOrbitalsGTO.
         """
         atoms = self.__new_atoms(gto, atoms)
-        i = 0
         for atom in atoms:
-            i = i + 1
-            atom.min_alpha = min(
-                [
-                    np.min(atom.gaussian_orbitals[i].alpha)
-                    for i in range(len(atom.gaussian_orbitals))
-                ]
-            )
-
-            for u in range(len(atom.gaussian_orbitals)):
-                atom.sum_chi_step += atom.gaussian_orbitals[u].chi_step()
+            orbitals = atom.gaussian_orbitals
+            atom.min_alpha = np.min(np.concatenate([orbital.alpha for orbital in orbitals]))
+            atom.sum_chi_step += sum(orbital.chi_step() for orbital in orbitals)
 
     # @staticmethod
     # def __parse_orbital_blocks(gto_block: List[Any]) -> List[GaussianOrbital]:
@@ -231,25 +232,3 @@ class MoldenFileReader:
     #             sections.append([j, lines[j]])
     #             j += i + 1
     #     return sections
-
-    @staticmethod
-    def __get_section_heads_and_positions(
-        lines: List[str], section_re: str
-    ) -> List[Any]:
-        re_filter = re.compile(section_re)
-        sections = [[i, line] for i, line in enumerate(lines) if re_filter.match(line)]
-        return sections
-
-    @staticmethod
-    def __split_by_sections(
-        lines: List[str], section_heads_and_positions: List[Any]
-    ) -> List[Any]:
-        blocks = []
-        for i in range(len(section_heads_and_positions)):
-            line_nr = section_heads_and_positions[i][0]
-            try:
-                next_line_nr = section_heads_and_positions[i + 1][0] - 1
-            except IndexError:
-                next_line_nr = len(lines) - 1
-            blocks.append(lines[line_nr: next_line_nr + 1])
-        return blocks
@@ -5,6 +5,9 @@ Copyright ETH Zurich, Department of Chemistry and Applied Biosciences, Reiher Gr
 See LICENSE.txt for details.
 """
 
+from itertools import chain
+from typing import List
+
 from .orbital_groups import OrbitalGroup, OrbitalGroupMap
 
 
@@ -12,18 +15,24 @@ class OrbitalGroupFileReader:
     @staticmethod
     def read_orbital_group_file(file_name: str):
         orbital_index_shift = 1
-        lines = open(file_name, "r").readlines()
-        lines.pop(0)
-        n_systems = OrbitalGroupFileReader.__get_n_systems(lines[0])
-        orbital_group = OrbitalGroup(n_systems)
-        map = OrbitalGroupMap([])
-        for line in lines:
-            n_indices = len(line.split())
-            if not n_indices and not orbital_group.empty():
-                orbital_group = OrbitalGroup(n_systems)
-                map.add_orbital_group(orbital_group)
-                continue
-            orbital_group.add_orbitals([int(i) + orbital_index_shift for i in line.split()])
+        with open(file_name, "r") as orbital_file:
+            orbital_file.readline()
+            first_line = orbital_file.readline()
+            n_systems = OrbitalGroupFileReader.__get_n_systems(first_line)
+            orbital_group = OrbitalGroup(n_systems)
+            map = OrbitalGroupMap([])
+            # the rows of the current group, handed over at once when the group ends
+            rows: List[List[int]] = []
+            # split every line only once, starting with the line that defined the number of systems
+            for indices in chain([first_line.split()], (line.split() for line in orbital_file)):
+                if not indices and rows:
+                    orbital_group.add_orbital_rows(rows)
+                    rows = []
+                    orbital_group = OrbitalGroup(n_systems)
+                    map.add_orbital_group(orbital_group)
+                    continue
+                rows.append([int(i) + orbital_index_shift for i in indices])
+        orbital_group.add_orbital_rows(rows)
         map.add_orbital_group(orbital_group)
         return map
 
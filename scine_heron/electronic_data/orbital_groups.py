@@ -18,10 +18,16 @@ class OrbitalGroup:
         return len(self._system_wise_indices)
 
     def add_orbitals(self, new_indices: List[int]):
-        if self.n_systems() != len(new_indices):
+        self.add_orbital_rows([new_indices])
+
+    def add_orbital_rows(self, rows: List[List[int]]):
+        """
+        Adds several rows of corresponding orbital indices, one index per system in each row.
+        """
+        if any(self.n_systems() != len(row) for row in rows):
             raise RuntimeError("The number of systems is inconsistent in the orbital mapping.")
-        for i_sys, i in enumerate(new_indices):
-            self._system_wise_indices[i_sys].add(i)
+        for indices, new_indices in zip(self._system_wise_indices, zip(*rows)):
+            indices.update(new_indices)
 
     def get_indices_for_system(self, i_sys: int) -> Set[int]:
         if i_sys >= self.n_systems():
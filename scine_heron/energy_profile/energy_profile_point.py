@@ -8,17 +8,15 @@ See LICENSE.txt for details.
 Provides the energy profile class
 """
 
-from datetime import datetime
+import time
 from typing import Optional
 
 
 class EnergyProfilePoint:
     def __init__(
-        self, energy: float = 0, elapsed_time: float = 0, time_stamp: Optional[datetime] = None
+        self, energy: float = 0, elapsed_time: float = 0, time_stamp: Optional[float] = None
     ):
         self.energy: float = energy
         self.elapsed_time: float = elapsed_time
-        if time_stamp is None:
-            self.time_stamp = datetime.now()
-        else:
-            self.time_stamp = time_stamp
+        # seconds on the monotonic clock, only differences are meaningful
+        self.time_stamp: float = time.monotonic() if time_stamp is None else time_stamp
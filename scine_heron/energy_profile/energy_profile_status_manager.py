@@ -8,9 +8,12 @@ See LICENSE.txt for details.
 Provides the EnergyProfileStatusManager class.
 """
 
-from typing import Any, List, Optional, TYPE_CHECKING
-from datetime import datetime
+import time
+from typing import Any, Optional, TYPE_CHECKING
+import numpy as np
 from PySide2.QtCore import QObject
+
+from scine_heron.energy_profile.energy_profile_point import EnergyProfilePoint
 if TYPE_CHECKING:
     Signal = Any
 else:
@@ -19,36 +22,58 @@ else:
 
 class EnergyProfileStatusManager(QObject):
     """
-    Provides a Status Manager that hold a list and emits events on resize
+    Provides a Status Manager that holds the energy profile and emits events on resize.
+    The energies, elapsed times and time stamps of the points are stored as rows of a growing numpy array.
+    Every append emits the new length; points are appended from worker threads, so the signal
+    is delivered to the GUI thread through a queued connection.
     """
 
-    changed_signal = Signal(list)
+    changed_signal = Signal(int)
 
     def __init__(self, *args: Any):
         super().__init__(*args)
-        self.value: List[Any] = []
+        self.__size = 0
+        self.__points = np.empty((3, 1024))
+
+    @property
+    def energies(self) -> np.ndarray:
+        return self.__points[0, :self.__size]
+
+    @property
+    def elapsed_times(self) -> np.ndarray:
+        return self.__points[1, :self.__size]
+
+    @property
+    def time_stamps(self) -> np.ndarray:
+        return self.__points[2, :self.__size]
 
-    def append(self, item: Any) -> None:
+    def append(self, item: EnergyProfilePoint) -> None:
         """
-        Appends data to inner list
+        Appends a point to the profile
         """
-        self.value.append(item)
-        self.changed_signal.emit(self.value)
+        if self.__size == self.__points.shape[1]:
+            grown = np.empty((3, 2 * self.__size))
+            grown[:, :self.__size] = self.__points
+            self.__points = grown
+        self.__points[:, self.__size] = (item.energy, item.elapsed_time, item.time_stamp)
+        self.__size += 1
+        self.changed_signal.emit(self.__size)
 
     def __len__(self) -> int:
         """
-        Returns the len of the inner list
+        Returns the number of points in the profile
         """
-        return len(self.value)
+        return self.__size
 
     def reset(self) -> None:
         """
-        Empties the inner list
+        Empties the profile
         """
-        self.value = []
+        self.__size = 0
 
     def get_latest_energy(self, seconds) -> Optional[float]:
-        if len(self.value) > 0:
-            if (datetime.now() - self.value[-1].time_stamp).total_seconds() < seconds:
-                return self.value[-1].energy
+        if self.__size > 0:
+            energy, _, time_stamp = self.__points[:, self.__size - 1]
+            if time.monotonic() - time_stamp < seconds:
+                return float(energy)
         return None
@@ -20,9 +20,8 @@ from scine_heron.utilities import (
 
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
-from datetime import datetime
-from typing import List, Optional
-from PySide2.QtCore import QSize
+from typing import List, Optional, Tuple
+from PySide2.QtCore import QSize, QTimer
 from PySide2.QtWidgets import (
     QDockWidget,
     QLabel,
@@ -36,11 +35,12 @@ from scine_heron.energy_profile.energy_profile_status_manager import (
     EnergyProfileStatusManager,
 )
 
-from scine_heron.energy_profile.energy_profile_point import EnergyProfilePoint
-
 
 class EnergyProfileWidget(QDockWidget):
     class Canvas(FigureCanvasQTAgg):  # type: ignore
+        # number of most recent points kept for plotting
+        history_size = 65536
+
         def __init__(
             self,
             parent: Optional[QWidget] = None,  # pylint: disable=unused-argument
@@ -53,8 +53,11 @@ class EnergyProfileWidget(QDockWidget):
             self.ax1 = self.fig.add_subplot(1, 1, 1, position=[0.15, 0.15, 0.75, 0.75])
             super(EnergyProfileWidget.Canvas, self).__init__(self.fig)
 
-            self.energies: List[float] = []
-            self.time_stamps: List[datetime] = []
+            # ring buffers holding every point twice, at i % history_size and i % history_size + history_size,
+            # so that the last history_size points are always a contiguous slice
+            self.__energies = np.empty(2 * self.history_size)
+            self.__time_stamps = np.empty(2 * self.history_size)
+            self.__n_points = 0
             self.fixed_time: bool = True
             self.fixed_time_interval: int = 10
             self.last_update: float = float(time.time())
@@ -63,7 +66,15 @@ class EnergyProfileWidget(QDockWidget):
             self.energy_unit: int = 0
             self.energy_type: int = 0
 
-            (self.__line,) = self.ax1.plot([], [], color=get_primary_line_color())
+            # the line is animated, i.e. left out of full draws and blitted onto the cached background
+            (self.__line,) = self.ax1.plot([], [], color=get_primary_line_color(), animated=True)
+            self.__background = None
+            self.mpl_connect("draw_event", self.__on_draw)
+            # new points are drawn at most ten times per second
+            self.__update_timer = QTimer(self)
+            self.__update_timer.setSingleShot(True)
+            self.__update_timer.setInterval(100)
+            self.__update_timer.timeout.connect(self.update_line)  # pylint: disable=no-member
 
             color_figure(self.fig)
             font = get_font()
@@ -77,66 +88,144 @@ class EnergyProfileWidget(QDockWidget):
                 )
             else:
                 self.ax1.set_ylabel(f"Energy in {self.energy_units[self.energy_unit]}")
+            self.__label_key = (self.energy_type < 2, self.energy_unit)
 
             self.draw()
 
+        def n_points(self) -> int:
+            return self.__n_points
+
+        def add_points(self, energies: np.ndarray, time_stamps: np.ndarray) -> None:
+            # older points would be overwritten within this call anyway
+            skipped = max(0, len(energies) - self.history_size)
+            slots = np.arange(self.__n_points + skipped, self.__n_points + len(energies)) % self.history_size
+            for buffer, values in ((self.__energies, energies), (self.__time_stamps, time_stamps)):
+                buffer[slots] = values[skipped:]
+                buffer[slots + self.history_size] = values[skipped:]
+            self.__n_points += len(energies)
+
+        def clear_points(self) -> None:
+            """
+            Drops all points, the buffers are kept and overwritten by the next points.
+            """
+            self.__n_points = 0
+
+        def reset_axis(self) -> None:
+            self.ax1.axis([-0.06, 0.06, -0.06, 0.06])
+            self.draw()
+
+        def request_update(self) -> None:
+            """
+            Schedules a redraw of the line, points added until then are drawn together.
+            """
+            if not self.__update_timer.isActive():
+                self.__update_timer.start()
+
         def update_line(self) -> None:
             unit_conversion = self._energy_conversions[self.energy_unit]
-            local_energies = self.energies
-            local_time_stamps = self.time_stamps
-            n = min(len(local_energies), len(local_time_stamps))
+            n = self.__n_points
             if n < 2:
                 return
-            now = self.time_stamps[-1]
-            if self.fixed_time:
-                x = np.array(
-                    [
-                        (i - now).total_seconds()
-                        for i in local_time_stamps[1:n]
-                        if (now - i).total_seconds() < self.fixed_time_interval
-                    ]
-                )
-                y = np.array(
-                    [
-                        i * unit_conversion
-                        for i, j in zip(local_energies[1:n], local_time_stamps[1:n])
-                        if (now - j).total_seconds() < self.fixed_time_interval
-                    ]
-                )
+            if n <= self.history_size:
+                # the first point of the profile is not shown
+                start, stop = 1, n
             else:
-                x = np.array(
-                    [
-                        (i - now).total_seconds()
-                        for i in local_time_stamps[1:n]
-                    ]
-                )
-                y = np.array(local_energies[1:n]) * unit_conversion
-
-            if self.energy_type == 0:
-                ref = y[-1]
-                y -= ref
-            elif self.energy_type == 1:
-                ref = np.min(y)
+                start = n % self.history_size
+                stop = start + self.history_size
+            now = self.__time_stamps[stop - 1]
+            if self.fixed_time:
+                # the time stamps are monotonic, so the window starts at the first one after the cutoff
+                start += int(np.searchsorted(
+                    self.__time_stamps[start:stop], now - self.fixed_time_interval, side="right"
+                ))
+            x = self.__time_stamps[start:stop] - now
+            y = self.__energies[start:stop] * unit_conversion
+
+            # one pass for the extrema, the shift to the reference moves them along
+            y_min = np.min(y)
+            y_max = np.max(y)
+            if self.energy_type < 2:
+                ref = y[-1] if self.energy_type == 0 else y_min
                 y -= ref
+                y_min -= ref
+                y_max -= ref
 
             if len(y) > 1 and len(x) > 1:
-                y_min = np.min(y)
-                y_max = np.max(y)
+                data_extents = (x[0], x[-1], y_min, y_max)
                 y_diff = y_max - y_min
                 y_corr = max((50 / 2625.5) * unit_conversion - y_diff, 0.1 * y_diff)
                 y_min -= 0.5 * y_corr
                 y_max += 0.5 * y_corr
-                x_min = np.min(x)
-                x_max = np.max(x)
+                # the time stamps are sorted
+                x_min = x[0]
+                x_max = x[-1]
                 x_diff = max(x_max - x_min, self.fixed_time_interval)
                 x_min -= 0.1 * x_diff
                 x_max += 0.1 * x_diff
 
-                self.__line.set_data(x, y)
-                self.__line.axes.axis([x_min, x_max, y_min, y_max])
-            self.draw()
+                self.__line.set_data(*self.__decimate(x, y))
+                limits = (x_min, x_max, y_min, y_max)
+                if self.__limits_changed(limits, data_extents):
+                    # new limits change the ticks, which requires a full draw;
+                    # no other axes share the limits, so there is nobody to notify
+                    self.ax1.set_xlim(limits[0], limits[1], emit=False, auto=False)
+                    self.ax1.set_ylim(limits[2], limits[3], emit=False, auto=False)
+                    self.__background = None
+            if self.__background is None:
+                self.draw()
+            else:
+                self.restore_region(self.__background)
+                self.ax1.draw_artist(self.__line)
+                self.blit(self.ax1.bbox)
+
+        def __decimate(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+            """
+            Reduces the line to the minimum and maximum of each pixel column, which
+            draws the same envelope as the full line with far fewer vertices.
+            """
+            n_columns = max(int(self.ax1.bbox.width), 1)
+            points_per_column = len(x) // n_columns
+            if points_per_column < 4:
+                return x, y
+            # the last points that do not fill a column, including the newest one, are kept as they are
+            n_binned = n_columns * points_per_column
+            binned = y[:n_binned].reshape((n_columns, points_per_column))
+            offsets = np.arange(n_columns) * points_per_column
+            first = np.argmin(binned, axis=1) + offsets
+            second = np.argmax(binned, axis=1) + offsets
+            indices = np.concatenate((
+                np.stack((np.minimum(first, second), np.maximum(first, second)), axis=1).ravel(),
+                np.arange(n_binned, len(x)),
+            ))
+            return x[indices], y[indices]
+
+        def __limits_changed(
+            self, limits: Tuple[float, float, float, float], data_extents: Tuple[float, float, float, float]
+        ) -> bool:
+            # the current axes are kept for small shifts of the limits, as long as they still contain all data
+            current = self.ax1.axis()
+            if not (current[0] <= data_extents[0] and data_extents[1] <= current[1]
+                    and current[2] <= data_extents[2] and data_extents[3] <= current[3]):
+                return True
+            x_tolerance = 0.05 * (limits[1] - limits[0])
+            y_tolerance = 0.05 * (limits[3] - limits[2])
+            return (
+                abs(limits[0] - current[0]) > x_tolerance
+                or abs(limits[1] - current[1]) > x_tolerance
+                or abs(limits[2] - current[2]) > y_tolerance
+                or abs(limits[3] - current[3]) > y_tolerance
+            )
+
+        def __on_draw(self, _) -> None:
+            # keep the freshly drawn axes without the line for the following blits
+            self.__background = self.copy_from_bbox(self.ax1.bbox)
+            self.ax1.draw_artist(self.__line)
 
         def redraw_axis(self) -> None:
+            label_key = (self.energy_type < 2, self.energy_unit)
+            if label_key == self.__label_key:
+                return
+            self.__label_key = label_key
             if self.energy_type < 2:
                 self.ax1.set_ylabel(
                     f"Relative energy in {self.energy_units[self.energy_unit]}"
@@ -165,7 +254,6 @@ class EnergyProfileWidget(QDockWidget):
         self.__widget_height = 30
 
         self.__canvas = self.Canvas(parent=self, width=width, height=height)
-        EnergyProfileWidget.__canvas = self.__canvas
 
         self.energy_status_manager = EnergyProfileStatusManager()
         self.energy_status_manager.changed_signal.connect(self.update_energy_widget)
@@ -222,11 +310,15 @@ class EnergyProfileWidget(QDockWidget):
     def set_time_window(self, fixed_time_interval: int) -> None:
         self.__canvas.fixed_time_interval = fixed_time_interval
 
-    def update_energy_widget(self, energy_profile: List[EnergyProfilePoint]) -> None:
-        self.__canvas.energies.append(energy_profile[-1].energy)
-        self.__canvas.time_stamps.append(energy_profile[-1].time_stamp)
+    def update_energy_widget(self, n_points: int) -> None:
+        # several points may have been appended since the last update
+        start = self.__canvas.n_points()
+        self.__canvas.add_points(
+            self.energy_status_manager.energies[start:n_points],
+            self.energy_status_manager.time_stamps[start:n_points],
+        )
         self.__canvas.last_update = float(time.time())
-        self.__canvas.update_line()
+        self.__canvas.request_update()
 
     def update_energy_unit(self, new_unit: int) -> None:
         self.__canvas.energy_unit = new_unit
@@ -239,8 +331,8 @@ class EnergyProfileWidget(QDockWidget):
         self.__canvas.update_line()
 
     def reset(self) -> None:
-        self.__canvas.energies = []
-        self.__canvas.time_stamps = []
+        self.__canvas.clear_points()
         self.__canvas.last_update = float(time.time())
+        self.__canvas.reset_axis()
         # Reset energy manager as well
         self.energy_status_manager.reset()
@@ -7,12 +7,14 @@ See LICENSE.txt for details.
 """
 Provides the HapticClient class.
 """
+from threading import Lock
 from PySide2.QtCore import QObject
 import typing
 if typing.TYPE_CHECKING:
     Signal = typing.Any
+    Slot = typing.Any
 else:
-    from PySide2.QtCore import Signal
+    from PySide2.QtCore import Signal, Slot
 
 try:
     import scine_heron_haptic as suh
@@ -24,6 +26,7 @@ class HapticSignals(QObject):
     """
     Inherited from QObject.
     Connect callback to UI.
+    Moves reported by the device faster than the UI handles them are merged into one move_signal.
     """
 
     move_signal = Signal(object, float, float, float)
@@ -33,6 +36,36 @@ class HapticSignals(QObject):
     second_button_down_signal = Signal(object)
     second_button_up_signal = Signal()
 
+    move_pending_signal = Signal()
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.__move_lock = Lock()
+        self.__pending_move: typing.Optional[typing.Tuple[typing.Any, float, float, float]] = None
+        self.move_pending_signal.connect(self.__emit_pending_move)
+
+    def queue_move(self, data: typing.Any, azimuth: float, elevation: float, zoom: float) -> None:
+        """
+        Called from the device thread, only the first move after a delivered one wakes up the UI thread.
+        """
+        with self.__move_lock:
+            pending = self.__pending_move
+            if pending is None:
+                self.__pending_move = (data, azimuth, elevation, zoom)
+            else:
+                # the rotations accumulate, the zoom factors multiply and the latest position wins
+                self.__pending_move = (data, pending[1] + azimuth, pending[2] + elevation, pending[3] * zoom)
+        if pending is None:
+            self.move_pending_signal.emit()
+
+    @Slot()  # type: ignore
+    def __emit_pending_move(self) -> None:
+        with self.__move_lock:
+            move = self.__pending_move
+            self.__pending_move = None
+        if move is not None:
+            self.move_signal.emit(*move)
+
 
 class HapticCallback(suh.HapticCallback):  # type: ignore[misc]
     """
@@ -47,7 +80,7 @@ class HapticCallback(suh.HapticCallback):  # type: ignore[misc]
     def move(
         self, data: suh.HapticData, azimuth: float, elevation: float, zoom: float
     ) -> None:
-        self.signals.move_signal.emit(data, azimuth, elevation, zoom)
+        self.signals.queue_move(data, azimuth, elevation, zoom)
 
     def first_button_down(self) -> None:
         self.signals.first_button_down_signal.emit()
@@ -17,6 +17,7 @@ except NameError:
     pass
 
 import numpy as np
+from functools import lru_cache
 from vtk import (
     vtkAtom,
     vtkMolecule,
@@ -24,6 +25,7 @@ from vtk import (
     vtkMatrix4x4,
     vtkCamera,
 )
+from vtk.util.numpy_support import vtk_to_numpy
 from typing import List, Optional
 
 from scine_utilities import (
@@ -32,11 +34,23 @@ from scine_utilities import (
 )
 
 
+@lru_cache(maxsize=128)
+def _covalent_radius(atomic_number: int) -> float:
+    """
+    Covalent radius in Angstrom of the element with the given atomic number,
+    there are at most 118 distinct values.
+    """
+    return ElementInfo.covalent_radius(ElementInfo.element(atomic_number)) * ANGSTROM_PER_BOHR
+
+
 class HapticClient:
     def __init__(self) -> None:
         self.device_is_available: bool = False
         self.transform = vtkTransform()
         self.callback: Optional[HapticCallback] = None
+        # reused by update_transform_matrix
+        self.__rotate_transform = vtkTransform()
+        self.__transform_matrix = vtkMatrix4x4()
 
     def init_haptic_device(self) -> None:
         try:
@@ -58,7 +72,7 @@ class HapticClient:
     ) -> None:
         if self.device_is_available:
             position = atom.GetPosition()
-            radius = ElementInfo.covalent_radius(ElementInfo.element(atom.GetAtomicNumber())) * ANGSTROM_PER_BOHR
+            radius = _covalent_radius(atom.GetAtomicNumber())
 
             atom = suh.AtomData(
                 atom_index, position.GetX(), position.GetY(), position.GetZ(), radius
@@ -70,23 +84,28 @@ class HapticClient:
                 self.haptic_device_manager.update_atom(atom)
 
     def update_molecule(self, molecule: vtkMolecule) -> None:
-        if self.device_is_available:
-            self.haptic_device_manager.clear_molecule()
-
-            for atom_index in range(molecule.GetNumberOfAtoms()):
-                self.update_atom(atom_index, molecule.GetAtom(atom_index), True)
+        if not self.device_is_available:
+            return
+        self.haptic_device_manager.clear_molecule()
+        if molecule.GetNumberOfAtoms() == 0:
+            return
+
+        # positions and elements of all atoms from the underlying arrays instead of one vtkAtom per atom
+        positions = vtk_to_numpy(molecule.GetAtomicPositionArray().GetData()).tolist()
+        atomic_numbers = vtk_to_numpy(molecule.GetAtomicNumberArray()).tolist()
+        for atom_index, (position, atomic_number) in enumerate(zip(positions, atomic_numbers)):
+            self.haptic_device_manager.add_atom(
+                suh.AtomData(atom_index, *position, _covalent_radius(atomic_number))
+            )
 
     def update_transform_matrix(
         self, camera: vtkCamera, azimuth: float, elevation: float
     ) -> None:
         view_up = camera.GetViewUp()
-        axis = [
-            -camera.GetViewTransformMatrix().GetElement(0, 0),
-            -camera.GetViewTransformMatrix().GetElement(0, 1),
-            -camera.GetViewTransformMatrix().GetElement(0, 2),
-        ]
+        view_matrix = camera.GetViewTransformMatrix()
+        axis = [-view_matrix.GetElement(0, i) for i in range(3)]
 
-        rotate_transform = vtkTransform()
+        rotate_transform = self.__rotate_transform
 
         # azimuth
         rotate_transform.Identity()
@@ -96,12 +115,9 @@ class HapticClient:
         rotate_transform.RotateWXYZ(elevation, axis)
         rotate_transform.Update()
 
-        transform = vtkTransform()
-        transform.Concatenate(rotate_transform)
-        transform.Concatenate(self.transform)
-        transform.Update()
-
-        self.transform = transform
+        # rotation applied after the current transformation, without chaining a new transform every call
+        vtkMatrix4x4.Multiply4x4(rotate_transform.GetMatrix(), self.transform.GetMatrix(), self.__transform_matrix)
+        self.transform.SetMatrix(self.__transform_matrix)
         self.__set_transformation_matrix()
 
     def __set_transformation_matrix(self) -> None:
@@ -117,13 +133,8 @@ class HapticClient:
 
     @staticmethod
     def __matrix2list(vtk_matrix: vtkMatrix4x4) -> List[float]:
-        matrix = list()
-
-        for i in range(0, 4):
-            for j in range(0, 4):
-                matrix.append(vtk_matrix.GetElement(i, j))
-
-        return matrix
+        # the 16 elements in row-major order, read in a single call
+        return list(vtk_matrix.GetData())
 
     def set_calc_gradient_in_loop(self, calc_gradient_in_loop: bool) -> None:
         if self.device_is_available:
@@ -131,8 +142,6 @@ class HapticClient:
 
     def update_gradient(self, gradients: np.ndarray, force_scaling: float = 1.0,) -> None:
         if self.device_is_available:
-            self.haptic_device_manager.update_gradient(
-                [
-                    force_scaling * elem for gradient in gradients for elem in gradient
-                ]  # convert 2d gradient to 1d
-            )
+            # convert 2d gradient to 1d
+            flat_gradient = force_scaling * np.asarray(gradients, dtype=float).ravel()
+            self.haptic_device_manager.update_gradient(flat_gradient.tolist())
@@ -9,12 +9,14 @@ Provides the HapticPointer class.
 """
 from typing import Any
 
+import numpy as np
 from vtk import (
     vtkTrivialProducer,
     vtkAlgorithmOutput,
 )
 from vtkmodules.vtkCommonCore import vtkPoints
 from vtkmodules.vtkCommonDataModel import vtkPolyData
+from vtk.util.numpy_support import numpy_to_vtk
 
 
 class HapticPointerData:
@@ -24,9 +26,10 @@ class HapticPointerData:
 
     def __init__(self) -> None:
 
-        # Center only
+        # Center only, the points share their memory with the array
+        self.__position = np.zeros((1, 3), dtype=np.float32)
         self.__center = vtkPoints()
-        self.__center.InsertPoint(0, 0.0, 0.0, 0.0)
+        self.__center.SetData(numpy_to_vtk(self.__position, deep=False))
         self.__center_data = vtkPolyData()
         self.__center_data.SetPoints(self.__center)
         self.__center_data_producer = vtkTrivialProducer()
@@ -47,5 +50,6 @@ class HapticPointerData:
         """
         Update pointer position.
         """
-        self.__center.InsertPoint(0, pos.x, pos.y, pos.z)
+        self.__position[0] = (pos.x, pos.y, pos.z)
+        self.__center.Modified()
         self.__center_data_producer.Modified()
@@ -4,7 +4,9 @@ __copyright__ = """ This code is licensed under the 3-clause BSD license.
 Copyright ETH Zurich, Department of Chemistry and Applied Biosciences, Reiher Group.
 See LICENSE.txt for details.
 """
+import numpy as np
 from vtk import (
+    vtkPoints,
     vtkPolyData,
     vtkAlgorithm,
     vtkSphereSource,
@@ -12,6 +14,7 @@ from vtk import (
     vtkActor,
     vtkInformationVector,
 )
+from vtk.util.numpy_support import numpy_to_vtk, vtk_to_numpy
 from vtk.util.vtkAlgorithm import VTKPythonAlgorithmBase
 from scine_heron.haptic.haptic_pointer_data import HapticPointerData
 
@@ -31,6 +34,18 @@ class PointToSphereAlgorithm(VTKPythonAlgorithmBase):  # type: ignore[misc]
             inputType=["vtkPolyData"],
             outputType="vtkPolyData",
         )
+        # the sphere is tessellated once around the origin and only translated afterwards
+        sphere = vtkSphereSource()
+        sphere.SetRadius(0.25)
+        sphere.SetPhiResolution(25)
+        sphere.SetThetaResolution(25)
+        sphere.Update()
+        self.__sphere = sphere.GetOutput()
+        self.__sphere_points = vtk_to_numpy(self.__sphere.GetPoints().GetData()).astype(float)
+        # the translated points are written in place into memory shared with the output points
+        self.__translated_points = np.empty_like(self.__sphere_points)
+        self.__output_points = vtkPoints()
+        self.__output_points.SetData(numpy_to_vtk(self.__translated_points, deep=False))
 
     def FillInputPortInformation(self, port: int, info: Any) -> int:
         """Sets the required input type to InputType."""
@@ -50,13 +65,11 @@ class PointToSphereAlgorithm(VTKPythonAlgorithmBase):  # type: ignore[misc]
 
         out_sphere = vtkPolyData.GetData(out_info)
 
-        sphere = vtkSphereSource()
-        sphere.SetCenter(*in_position)
-        sphere.SetRadius(0.25)
-        sphere.SetPhiResolution(25)
-        sphere.SetThetaResolution(25)
-        sphere.Update()
-        out_sphere.DeepCopy(sphere.GetOutput())
+        # share the cells and normals of the cached sphere, only the points move
+        out_sphere.ShallowCopy(self.__sphere)
+        np.add(self.__sphere_points, in_position, out=self.__translated_points)
+        self.__output_points.Modified()
+        out_sphere.SetPoints(self.__output_points)
 
         return 1
 
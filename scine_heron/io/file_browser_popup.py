@@ -5,18 +5,33 @@ Copyright ETH Zurich, Department of Chemistry and Applied Biosciences, Reiher Gr
 See LICENSE.txt for details.
 """
 
+from functools import lru_cache
 from pathlib import Path
 from os import path
-from typing import Callable, Optional, List
+from typing import Callable, Optional, List, Tuple
 from PySide2.QtWidgets import QFileDialog, QWidget
 
 from scine_heron.utilities import write_error_message, write_info_message
 
 
+@lru_cache(maxsize=64)
+def _build_filter(extensions: Tuple[str, ...]) -> Tuple[str, str, Tuple[str, ...]]:
+    """
+    Returns the default extension, the QFileDialog filter string and the
+    extensions with leading '.' for the given extensions.
+    Example: ("pkl", "json") --> ("pkl", "*.pkl *.json", (".pkl", ".json"))
+    """
+    if not extensions:
+        extensions = ("*",)
+    filter_string = ' *.'.join(['', *extensions])[1:]
+    checked_extensions = tuple(f'.{e}' if not e.startswith('.') else e for e in extensions)
+    return extensions[0], filter_string, checked_extensions
+
+
 def _valid_extension(file_name: Path, allowed_extensions: List[str]) -> bool:
-    checked_extensions = [f'.{e}' if not e.startswith('.') else e for e in allowed_extensions]
+    checked_extensions = _build_filter(tuple(allowed_extensions))[2]
     if file_name.suffix not in checked_extensions:
-        write_error_message(f"Unsupported file extension '{file_name.suffix}', allowed are {checked_extensions}")
+        write_error_message(f"Unsupported file extension '{file_name.suffix}', allowed are {list(checked_extensions)}")
         return False
     return True
 
@@ -48,14 +63,12 @@ def get_load_file_name(parent: QWidget, default_name: str, valid_extensions: Lis
     Path
         The file name as a Path object
     """
-    if not valid_extensions:
-        valid_extensions = ["*"]
+    default_extension, filter_string, _ = _build_filter(tuple(valid_extensions))
     filename, _ = QFileDialog.getOpenFileName(
         parent,
         parent.tr("Open File"),  # type: ignore[arg-type]
-        default_name + "." + valid_extensions[0],
-        parent.tr(f"{default_name} ({' *.'.join(['', *valid_extensions])[1:]})"),  # type: ignore[arg-type]
-        # explanation last line: valid_extension = ["pkl", "json"] --> string after default_name = (*.pkl *json)
+        default_name + "." + default_extension,
+        parent.tr(f"{default_name} ({filter_string})"),  # type: ignore[arg-type]
     )
     if not filename:
         write_info_message("Aborted loading")
@@ -98,13 +111,12 @@ def get_save_file_name(parent: QWidget, default_name: str, valid_extensions: Lis
     Path
         The file name as a Path object
     """
-    if not valid_extensions:
-        valid_extensions = ["*"]
+    default_extension, filter_string, _ = _build_filter(tuple(valid_extensions))
     filename, _ = QFileDialog.getSaveFileName(
         parent,
         parent.tr("Save File"),  # type: ignore[arg-type]
-        default_name + "." + valid_extensions[0],
-        parent.tr(f"{default_name} ({' *.'.join(['', *valid_extensions])[1:]})"),  # type: ignore[arg-type]
+        default_name + "." + default_extension,
+        parent.tr(f"{default_name} ({filter_string})"),  # type: ignore[arg-type]
     )
     if not filename:
         write_info_message("Aborted saving")
@@ -11,10 +11,16 @@ jsonpickle allows to safe an object in an human-readable format.
 """
 
 
+import ast
 from enum import Enum
+from functools import lru_cache
+from threading import Lock
 from typing import Any, TYPE_CHECKING
 import jsonpickle
 import jsonpickle.ext.numpy as jsonpickle_numpy
+from jsonpickle import tags
+from jsonpickle.unpickler import loadclass
+import numpy as np
 
 from scine_utilities import ElementInfo, ElementType, AtomCollection
 
@@ -34,18 +40,32 @@ else:
     _PlaceHolderModelProxy = importer("scine_chemoton.utilities.place_holder_model", "_PlaceHolderModelProxy")
 
 
+@lru_cache(maxsize=None)
+def _load_class(class_name: str) -> Any:
+    cls = loadclass(class_name)
+    if cls is None:
+        raise ValueError(f"Could not load class '{class_name}'")
+    return cls
+
+
 class EnumHandler(jsonpickle.handlers.BaseHandler):
     """
     This handler exists because jsonpickle has problems with our Enum derived classes.
+    The member is looked up by name in the class stored by jsonpickle.
     """
 
     def flatten(self, obj, data):
         data['value'] = self.context.flatten(repr(obj), reset=False)
+        data['name'] = self.context.flatten(obj.name, reset=False)
         return data
 
     def restore(self, obj):
-        return self.context.restore(eval(obj['value'].split("<")[-1].split(":")[0]),  # pylint: disable=eval-used
-                                    reset=False)
+        if 'name' in obj:
+            name = obj['name']
+        else:
+            # older files only hold the representation, e.g. '<Status.WAITING: 1>'
+            name = obj['value'].split("<")[-1].split(":")[0].split(".")[-1]
+        return self.context.restore(getattr(_load_class(obj[tags.OBJECT]), name), reset=False)
 
 
 class ProxyHandler(jsonpickle.handlers.BaseHandler):
@@ -69,6 +89,7 @@ class SimpleReprEvalHandler(jsonpickle.handlers.BaseHandler):
     """
     This handler offers an easy implementation for all classes that work with an
     eval(repr(inst)) call.
+    The representation is not evaluated, only a constructor call with literal arguments is accepted.
     """
 
     def flatten(self, obj, data):
@@ -76,8 +97,14 @@ class SimpleReprEvalHandler(jsonpickle.handlers.BaseHandler):
         return data
 
     def restore(self, obj):
-        return self.context.restore(eval(obj['value']),  # pylint: disable=eval-used
-                                    reset=False)
+        cls = _load_class(obj[tags.OBJECT])
+        call = ast.parse(obj['value'], mode="eval").body
+        if not isinstance(call, ast.Call) or not isinstance(call.func, ast.Name) or call.func.id != cls.__name__ \
+                or any(k.arg is None for k in call.keywords):
+            raise ValueError(f"Cannot restore '{obj['value']}', expected a call of the constructor of {cls.__name__}")
+        args = [ast.literal_eval(arg) for arg in call.args]
+        kwargs = {k.arg: ast.literal_eval(k.value) for k in call.keywords}
+        return self.context.restore(cls(*args, **kwargs), reset=False)
 
 
 class ElementHandler(jsonpickle.handlers.BaseHandler):
@@ -97,24 +124,48 @@ class ElementHandler(jsonpickle.handlers.BaseHandler):
 class AtomCollectionHandler(jsonpickle_numpy.NumpyGenericHandler):
     """
     This handler stores Scine AtomCollections by saving elements and positions separately.
-    It inherits from NumpyGenericHandler to store the positions as numpy arrays.
+    It inherits from NumpyGenericHandler to store the positions and the integer values of the
+    element types, which also distinguish isotopes, as numpy arrays.
     """
+    _elements_by_value = {int(e): ElementType(int(e)) for e in ElementType.__members__.values()}
 
     def flatten(self, obj, data):
         pos_data = {}
         data['positions'] = super().flatten(obj.positions, pos_data)
-        data['elements'] = self.context.flatten(repr([str(e) for e in obj.elements]), reset=False)
+        element_data = {}
+        data['element_values'] = super().flatten(np.array([int(e) for e in obj.elements], dtype=np.int32),
+                                                 element_data)
         return data
 
     def restore(self, data):
-        elements = self.context.restore([ElementInfo.element_from_symbol(e)
-                                         for e in eval(data['elements'])],  # pylint: disable=eval-used
-                                        reset=False)
+        if 'element_values' in data:
+            element_values = super().restore(data['element_values']).tolist()
+            elements = [self._elements_by_value[v] for v in element_values]
+        else:
+            # older files store the element symbols
+            elements = [ElementInfo.element_from_symbol(e) for e in ast.literal_eval(data['elements'])]
+        elements = self.context.restore(elements, reset=False)
         positions = super().restore(data['positions'])
         return AtomCollection(elements, positions)
 
 
-def encode(obj: Any) -> str:
+# the contexts are reset at the start of every call and reused, the lock keeps calls from different threads apart
+_context_lock = Lock()
+_pickler = jsonpickle.pickler.Pickler(
+    keys=True,  # otherwise non-string keys will fail
+    unpicklable=True,  # just to be sure in case of future changes
+    make_refs=False,  # python ids are not preserved
+    warn=True,  # warn about unpicklable objects, safer development for now
+    max_iter=-1,  # no limit
+    include_properties=False,  # can fail for class attributes
+)
+_unpickler = jsonpickle.unpickler.Unpickler(
+    keys=True,  # otherwise non-string keys will fail
+    on_missing='error',
+)
+
+
+def encode(obj: Any, *, pretty: bool = False) -> str:
     """
     A wrap with default parameters for jsonpickle.encode.
 
@@ -122,22 +173,19 @@ def encode(obj: Any) -> str:
     ----------
     obj : Any
         The object to encode
+    pretty : bool, optional
+        If the output should be indented for human readers, by default False,
+        which writes the compact form that is smaller and faster to encode and decode
 
     Returns
     -------
     str
         The encoded object as a string
     """
-    return jsonpickle.encode(obj,
-                             keys=True,  # otherwise non-string keys will fail
-                             unpicklable=True,  # just to be sure in case of future changes
-                             make_refs=False,  # python ids are not preserved
-                             warn=True,  # warn about unpicklable objects, safer development for now
-                             max_iter=-1,  # no limit
-                             indent=2,  # pretty print
-                             separators=(",", ": "),  # pretty print
-                             include_properties=False,  # can fail for class attributes
-                             )
+    with _context_lock:
+        if pretty:
+            return jsonpickle.encode(obj, context=_pickler, indent=2, separators=(",", ": "))
+        return jsonpickle.encode(obj, context=_pickler, separators=(",", ":"))
 
 
 def decode(obj: str) -> Any:
@@ -154,24 +202,29 @@ def decode(obj: str) -> Any:
     Any
         The decoded object
     """
-    return jsonpickle.decode(obj,
-                             keys=True,  # otherwise non-string keys will fail
-                             on_missing='error')
+    with _context_lock:
+        return jsonpickle.decode(obj, context=_unpickler)
+
+
+def _register_handlers() -> None:
+    """
+    jsonpickle finds handlers by exact type, so all enum derived classes have to be registered separately.
+    Only the explicitly imported optional classes are registered, which keeps the written format
+    independent of the modules that happen to be imported.
+    """
+    for handler, optional_types in (
+        (EnumHandler, (Status, LogicCoupling, Label)),
+        (SimpleReprEvalHandler, (LebedevSphere,)),
+        (ProxyHandler, (PlaceHolderModelType,)),
+    ):
+        for optional_type in optional_types:
+            if is_imported(optional_type):
+                handler.handles(optional_type)
+    EnumHandler.handles(Enum)
+    ElementHandler.handles(ElementType)
+    AtomCollectionHandler.handles(AtomCollection)
+    jsonpickle_numpy.register_handlers()  # numpy objects
 
 
 # register all Handlers automatically when this module is imported
-EnumHandler.handles(Enum)
-# have to register all enum derived classes separate
-if is_imported(Status):
-    EnumHandler.handles(Status)
-if is_imported(LogicCoupling):
-    EnumHandler.handles(LogicCoupling)
-if is_imported(Label):
-    EnumHandler.handles(Label)
-if is_imported(LebedevSphere):
-    SimpleReprEvalHandler.handles(LebedevSphere)
-if is_imported(PlaceHolderModelType):
-    ProxyHandler.handles(PlaceHolderModelType)
-ElementHandler.handles(ElementType)
-AtomCollectionHandler.handles(AtomCollection)
-jsonpickle_numpy.register_handlers()  # numpy objects
+_register_handlers()
@@ -7,27 +7,61 @@ See LICENSE.txt for details.
 """
 Functions that abstract sending and receiving data
 between a server and a client.
-The data is now serialized using json.
+The data is now serialized using json,
+numpy arrays in the data are sent as raw buffers after the json.
 """
 import json
 import struct
 import typing
 from socket import socket as Socket
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# key of the json object standing in for the numpy array sent as the buffer with the given index
+_ARRAY_KEY = "__clientserver_ndarray__"
+# size of the json and number of array buffers, then the size of each buffer before it
+_HEADER = struct.Struct("!QI")
+_BUFFER_HEADER = struct.Struct("!Q")
+
 
 def send_data(data: typing.Any, socket: Socket) -> None:
     """
     Serialise and send data through a socket.
-    The size of the dataset is prepended to the real data,
+    The size of the dataset and the number of array buffers are prepended to the real data,
     so that the receiver knows how large is the dataset.
+    Each array buffer follows with its own size.
     Retry until it is done.
     """
-    serialized = json.dumps(data)
-    raw_data = bytes(serialized, encoding="utf-8")
-    sizeinfo = struct.pack("!i", len(raw_data))  # Sending an integer
+    buffers: typing.List[np.ndarray] = []
+
+    def replace_array(obj: typing.Any) -> typing.Any:
+        if not isinstance(obj, np.ndarray):
+            raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+        if obj.dtype.kind not in "biufc":
+            # strings and objects are not plain numbers
+            return obj.tolist()
+        buffers.append(np.ascontiguousarray(obj))
+        return {_ARRAY_KEY: len(buffers) - 1, "dtype": obj.dtype.str, "shape": obj.shape}
 
-    socket.sendall(sizeinfo)
-    socket.sendall(raw_data)
+    raw_data = json.dumps(data, default=replace_array).encode("utf-8")
+    sizeinfo = _HEADER.pack(len(raw_data), len(buffers))
+
+    # the small headers go out in one call with the json or with the size of the following array;
+    # both ends set TCP_NODELAY, since a message is complete once written, and holding back
+    # its last packet until more data arrives would only delay the reply
+    message = sizeinfo + raw_data
+    for buffer in buffers:
+        socket.sendall(message + _BUFFER_HEADER.pack(buffer.nbytes))
+        # the array memory is sent as is, without an intermediate bytes object
+        socket.sendall(buffer.reshape(-1).view(np.uint8))
+        message = b""
+    if message:
+        socket.sendall(message)
 
 
 def recv_data(connection: Socket) -> typing.Any:
@@ -36,15 +70,49 @@ def recv_data(connection: Socket) -> typing.Any:
     It is expected that the first datum that comes out
     will be the size of the data sent through.
     """
-    buf = bytearray()
-    while len(buf) < 4:
-        buf += connection.recv(4 - len(buf))
-    (size_to_receive,) = struct.unpack("!i", buf)
+    size_to_receive, n_buffers = _HEADER.unpack(_recv_exactly(connection, _HEADER.size))
+    raw_data = _recv_exactly(connection, size_to_receive)
+    if n_buffers == 0:
+        return _loads(raw_data)
+
+    buffers = []
+    for _ in range(n_buffers):
+        (buffer_size,) = _BUFFER_HEADER.unpack(_recv_exactly(connection, _BUFFER_HEADER.size))
+        buffers.append(_recv_exactly(connection, buffer_size))
+
+    def restore_array(obj: typing.Dict[str, typing.Any]) -> typing.Any:
+        if _ARRAY_KEY not in obj:
+            return obj
+        return np.frombuffer(buffers[obj[_ARRAY_KEY]], dtype=obj["dtype"]).reshape(obj["shape"])
+
+    return json.loads(raw_data, object_hook=restore_array)
+
+
+def _recv_exactly(connection: Socket, size: int) -> bytearray:
+    """
+    Receive exactly size bytes directly into one preallocated buffer.
+    Raises a ConnectionError if the connection is closed before.
+    """
+    buf = bytearray(size)
+    view = memoryview(buf)
     size_received = 0
-    data_received = bytearray()
-    while len(data_received) < size_to_receive:
-        chunksize = min(4096, size_to_receive - size_received)
-        data_received += connection.recv(chunksize)
-    data_decoded = data_received.decode("utf-8")
+    while size_received < size:
+        n_received = connection.recv_into(view[size_received:], size - size_received)
+        if n_received == 0:
+            raise ConnectionError("Connection closed before all data was received")
+        size_received += n_received
+    return buf
 
-    return json.loads(data_decoded)
+
+def _loads(raw_data: bytearray) -> typing.Any:
+    """
+    Deserialize the received bytes, with orjson if it is installed.
+    orjson does not know the Infinity and NaN literals that json.dumps writes,
+    such messages are read with json instead.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(raw_data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw_data)
@@ -64,9 +64,6 @@ def get_results_to_send(
         gradient = mediator_potential.get_gradients(positions)
         charges = mediator_potential.get_atomic_charges()
         bond_orders = mediator_potential.bond_orders
-        if bond_orders is not None:
-            # nd.array is not JSON serializable, so we convert it to a list
-            bond_orders = bond_orders.tolist()
         molden_input = mediator_potential.molden_input
         settings = mediator_potential.settings
     return energy, gradient, charges, bond_orders, molden_input, settings
@@ -92,6 +89,7 @@ def server(
     while True:
         conn, _ = s.accept()
         with conn:
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             stop_signal, molecule_version, molecule, calculator_args, settings, mediator_potential_signal, \
                 bond_orders_type = recv_data(conn)
             shared_data["stop_signal"] = stop_signal
@@ -142,7 +140,7 @@ def server(
                 mediator_potential, positions, molecule_version, len(molecule)
             )
 
-            send_data([energy, gradient.tolist(), charges, bond_orders, molden_input,
+            send_data([energy, gradient, charges, bond_orders, molden_input,
                        error_msg, info_msg, settings, mediator_potential_signal],
                       conn,
                       )
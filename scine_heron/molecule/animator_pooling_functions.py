@@ -39,6 +39,7 @@ def calculate_gradient(
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
         try:
             s.connect(("127.0.0.1", 55145))
+            s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             clientserver.send_data(
                 data=[
                     stop_signal,
@@ -75,10 +76,9 @@ def calculate_gradient(
         if new_settings != settings:
             settings = new_settings
         if bond_orders is not None:
-            # nd.array is not JSON serializable, so we convert it back from a list
-            bond_orders = np.array(bond_orders)
+            bond_orders = np.asarray(bond_orders)
     return GradientCalculationResult(
-        gradients=np.array(gradients),
+        gradients=np.asarray(gradients),
         energy=energy,
         settings=settings,
         atomic_charges=charges,
@@ -76,10 +76,9 @@ def create_molecule_animator(
                     energy_profile_point = EnergyProfilePoint(
                         energy, 0.0
                     )
-                    previous_time = energy_status_manager.value[-1].elapsed_time
-                    delta = energy_profile_point.time_stamp - energy_status_manager.value[-1].time_stamp
-                    delta_float = delta.total_seconds()
-                    energy_profile_point.elapsed_time = previous_time + delta_float
+                    previous_time = energy_status_manager.elapsed_times[-1]
+                    delta = energy_profile_point.time_stamp - energy_status_manager.time_stamps[-1]
+                    energy_profile_point.elapsed_time = previous_time + delta
 
                     energy_status_manager.append(energy_profile_point)
 
@@ -693,6 +693,9 @@ class MoleculeWidget(QWidget):
             atoms_to_consider,
             self.__settings_status_manager,
         )
+        if new_molecule is self.__molecule:
+            # no position found for the new atom
+            return
 
         self.__plug_in_new_molecule(new_molecule)
 
@@ -854,7 +854,7 @@ class DictOptionWidget(QFrame):
         try:
             if filename.suffix == ".json":
                 with open(filename, "w") as f:
-                    f.write(encode(data))
+                    f.write(encode(data, pretty=True))
             elif filename.suffix in [".pickle", ".pkl"]:
                 with open(filename, "wb") as f:
                     pickle.dump(data, f)
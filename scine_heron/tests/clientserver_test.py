@@ -5,6 +5,7 @@ Copyright ETH Zurich, Department of Chemistry and Applied Biosciences, Reiher Gr
 See LICENSE.txt for details.
 """
 from scine_heron.mediator_potential import clientserver
+import numpy as np
 import pytest
 from hypothesis import strategies as st
 from hypothesis import given
@@ -24,7 +25,7 @@ class SocketPairMock:
     (e.g., a socket that has been already created and connected,
     and a socket generated by the accept() method on a listening socket)
 
-    The mock sockets implement only 'recv' and 'sendall',
+    The mock sockets implement only 'recv', 'recv_into' and 'sendall',
     but can be easily expanded.
 
     Only A->B communication is used.
@@ -50,8 +51,14 @@ class SocketPairMock:
             self._data[0] = self._data[0][size:]
             return res
 
+        def recv_into(buffer: memoryview, size: int) -> int:
+            res = recv(size)
+            buffer[:len(res)] = res
+            return len(res)
+
         _socket = Box()
         _socket.recv = recv
+        _socket.recv_into = recv_into
 
         return _socket
 
@@ -83,6 +90,26 @@ def test_sendrecv_pair_mock(data_to_send: Any) -> None:
     assert received_data == data_to_send
 
 
+def test_sendrecv_arrays_pair_mock() -> None:
+    """
+    Test that numpy arrays are received as arrays with the same dtype, shape and values.
+    """
+    socket_pair = SocketPairMock()
+    socketA, connection = socket_pair.get_socketA(), socket_pair.get_socketB()
+
+    gradient = np.arange(12, dtype=np.float64).reshape((4, 3)) / 7
+    bond_orders = np.eye(4).T[::2]
+    clientserver.send_data([1.5, gradient, {"bond_orders": bond_orders, "empty": np.zeros((0, 3))}], socketA)
+    received_data = clientserver.recv_data(connection)
+
+    assert received_data[0] == 1.5
+    for sent, received in ((gradient, received_data[1]), (bond_orders, received_data[2]["bond_orders"]),
+                           (np.zeros((0, 3)), received_data[2]["empty"])):
+        assert isinstance(received, np.ndarray)
+        assert received.dtype == sent.dtype
+        assert np.array_equal(received, sent)
+
+
 @pytest.fixture(name="socket_pair", scope="session")  # type: ignore[misc]
 def get_socket_pair() -> Generator[Tuple[Socket, Socket], None, None]:
     """
@@ -7,7 +7,8 @@ See LICENSE.txt for details.
 from hypothesis import given, assume
 from hypothesis import strategies as st
 from typing import List
-from scine_heron.edit_molecule.collision import collision, collision_multiple
+import numpy as np
+from scine_heron.edit_molecule.collision import collision, collision_any, collision_multiple
 
 
 def test_collision_yes() -> None:
@@ -54,3 +55,14 @@ def test_collision_multiple_no(positions: List[List[float]]) -> None:
     radii = [r for _ in positions]
     assume(not any(collision(r, position, r, p) for p in positions))
     assert not collision_multiple(r, position, radii, positions)  # type: ignore[misc]
+
+
+@given(
+    st.lists(st.lists(st.floats(-1, 1), min_size=3, max_size=3), min_size=1, max_size=5),
+    st.floats(0.01, 0.5),
+)
+def test_collision_any_same_as_pairwise(positions: List[List[float]], r: float) -> None:
+    position = np.zeros(3)
+    radii = [r for _ in positions]
+    expected = any(collision(r, position, r, p) for p in positions)
+    assert collision_any(r, position, np.array(radii), np.array(positions)) == expected
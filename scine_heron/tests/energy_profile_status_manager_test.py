@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+__copyright__ = """ This code is licensed under the 3-clause BSD license.
+Copyright ETH Zurich, Department of Chemistry and Applied Biosciences, Reiher Group.
+See LICENSE.txt for details.
+"""
+"""
+Contains tests for the EnergyProfileStatusManager class.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from PySide2.QtCore import QCoreApplication
+from PySide2.QtWidgets import QApplication
+
+from scine_heron.energy_profile.energy_profile_point import EnergyProfilePoint
+from scine_heron.energy_profile.energy_profile_status_manager import EnergyProfileStatusManager
+
+
+def test_append_stores_points() -> None:
+    manager = EnergyProfileStatusManager()
+    for i in range(2000):
+        manager.append(EnergyProfilePoint(energy=float(i), elapsed_time=0.5 * i, time_stamp=2.0 * i))
+
+    assert len(manager) == 2000
+    assert manager.energies[-1] == 1999.0
+    assert manager.elapsed_times[-1] == 999.5
+    assert manager.time_stamps[-1] == 3998.0
+    manager.reset()
+    assert len(manager) == 0
+
+
+def test_append_from_worker_thread_notifies(_app: QApplication) -> None:
+    """
+    Points are appended in the done callbacks of the animator's executor, i.e. in a worker thread,
+    the changes still have to reach the GUI thread.
+    """
+    manager = EnergyProfileStatusManager()
+    received: List[int] = []
+    manager.changed_signal.connect(received.append)
+
+    def append_points() -> None:
+        for i in range(3):
+            manager.append(EnergyProfilePoint(energy=float(i), elapsed_time=0.0))
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(append_points).result()
+    assert not received  # queued for the GUI thread
+
+    deadline = time.monotonic() + 5.0
+    while len(received) < 3 and time.monotonic() < deadline:
+        QCoreApplication.processEvents()
+
+    assert received == [1, 2, 3]
+    assert manager.energies.tolist() == [0.0, 1.0, 2.0]
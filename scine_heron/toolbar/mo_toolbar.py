@@ -61,14 +61,6 @@ class MOToolbar(HeronToolBar):
         self.__automatic_updates = False
         self.setMinimumWidth(3000)
 
-    def reset_plot(self) -> None:
-        from scine_heron.energy_profile.energy_profile_widget import (
-            EnergyProfileWidget
-        )
-        ax = EnergyProfileWidget._EnergyProfileWidget__canvas._Canvas__line.axes
-        ax.axis([-0.06, 0.06, -0.06, 0.06])
-        EnergyProfileWidget._EnergyProfileWidget__canvas.draw()
-
     def __load_file(self) -> None:
         """
         Load molecule from file.
@@ -82,7 +74,6 @@ class MOToolbar(HeronToolBar):
 
         if filename:
             self.load_file_signal.emit(Path(filename))
-            self.reset_plot()
 
     def __save_file(self) -> None:
         """